@@ -1,25 +1,30 @@
 from django.contrib import admin
+from django.urls import reverse
+from django.utils.html import format_html
+from .counters import deferred_question_counts, refresh_question_counts
 from .models import (
     KnowledgeCategory, Technology, Question, Answer, 
-    QuestionView, QuestionVote, AnswerVote, FAQ, KnowledgeArticle
+    QuestionView, QuestionVote, AnswerVote, FAQ, KnowledgeArticle, UserActivityStat
 )
 
 
 @admin.register(KnowledgeCategory)
 class KnowledgeCategoryAdmin(admin.ModelAdmin):
-    list_display = ['name', 'parent', 'color', 'order', 'is_active', 'created_at']
+    list_display = ['name', 'parent', 'color', 'order', 'approved_question_count', 'is_active', 'created_at']
     list_filter = ['parent', 'is_active', 'created_at']
     search_fields = ['name', 'description']
     list_editable = ['order', 'is_active']
+    readonly_fields = ['approved_question_count']
     prepopulated_fields = {'color': ('name',)}
 
 
 @admin.register(Technology)
 class TechnologyAdmin(admin.ModelAdmin):
-    list_display = ['name', 'color', 'is_active', 'created_at']
+    list_display = ['name', 'color', 'approved_question_count', 'is_active', 'created_at']
     list_filter = ['is_active', 'created_at']
     search_fields = ['name', 'description']
     list_editable = ['color', 'is_active']
+    readonly_fields = ['approved_question_count']
 
 
 @admin.register(Question)
@@ -28,7 +33,8 @@ class QuestionAdmin(admin.ModelAdmin):
     list_filter = ['category', 'difficulty', 'priority', 'status', 'technologies', 'is_active', 'created_at']
     search_fields = ['title', 'content']
     list_editable = ['status', 'priority']
-    raw_id_fields = ['created_by', 'approved_by']
+    list_select_related = ['category']
+    autocomplete_fields = ['created_by', 'approved_by']
     filter_horizontal = ['technologies', 'tags']
     
     fieldsets = (
@@ -42,7 +48,7 @@ class QuestionAdmin(admin.ModelAdmin):
             'fields': ('status', 'approved_by', 'approved_at')
         }),
         ('İstatistikler', {
-            'fields': ('view_count', 'helpful_count', 'not_helpful_count'),
+            'fields': ('view_count', 'helpful_count', 'not_helpful_count', 'vote_summary'),
             'classes': ('collapse',)
         }),
         ('Sistem Bilgileri', {
@@ -51,7 +57,33 @@ class QuestionAdmin(admin.ModelAdmin):
         })
     )
     
-    readonly_fields = ['view_count', 'helpful_count', 'not_helpful_count']
+    readonly_fields = ['view_count', 'helpful_count', 'not_helpful_count', 'vote_summary']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'category', 'created_by'
+        ).prefetch_related('technologies', 'tags')
+    
+    def delete_queryset(self, request, queryset):
+        # Soru başına sayaç yenilemek yerine etkilenen kategori/teknolojiler bir kez yenilenir
+        pks = list(queryset.values_list('pk', flat=True))
+        category_ids = set(
+            Question.objects.filter(pk__in=pks).values_list('category_id', flat=True)
+        ) - {None}
+        technology_ids = set(
+            Question.technologies.through.objects.filter(question_id__in=pks).values_list('technology_id', flat=True)
+        )
+        with deferred_question_counts():
+            super().delete_queryset(request, queryset)
+        refresh_question_counts(category_ids, technology_ids)
+    
+    @admin.display(description='Oylar')
+    def vote_summary(self, obj):
+        url = reverse('admin:askgt_questionvote_changelist')
+        return format_html(
+            '👍 {} / 👎 {} — <a href="{}?question__id__exact={}">oyları görüntüle</a>',
+            obj.helpful_count, obj.not_helpful_count, url, obj.id
+        )
 
 
 @admin.register(Answer)
@@ -60,7 +92,8 @@ class AnswerAdmin(admin.ModelAdmin):
     list_filter = ['is_accepted', 'is_official', 'status', 'code_language', 'is_active', 'created_at']
     search_fields = ['content', 'question__title']
     list_editable = ['is_accepted', 'is_official', 'status']
-    raw_id_fields = ['question', 'created_by']
+    list_select_related = ['question']
+    autocomplete_fields = ['question', 'created_by']
     
     fieldsets = (
         ('Temel Bilgiler', {
@@ -74,7 +107,7 @@ class AnswerAdmin(admin.ModelAdmin):
             'fields': ('status', 'is_accepted', 'is_official')
         }),
         ('İstatistikler', {
-            'fields': ('helpful_count', 'not_helpful_count'),
+            'fields': ('helpful_count', 'not_helpful_count', 'vote_summary'),
             'classes': ('collapse',)
         }),
         ('Sistem Bilgileri', {
@@ -83,7 +116,18 @@ class AnswerAdmin(admin.ModelAdmin):
         })
     )
     
-    readonly_fields = ['helpful_count', 'not_helpful_count']
+    readonly_fields = ['helpful_count', 'not_helpful_count', 'vote_summary']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('question__category', 'created_by')
+    
+    @admin.display(description='Oylar')
+    def vote_summary(self, obj):
+        url = reverse('admin:askgt_answervote_changelist')
+        return format_html(
+            '👍 {} / 👎 {} — <a href="{}?answer__id__exact={}">oyları görüntüle</a>',
+            obj.helpful_count, obj.not_helpful_count, url, obj.id
+        )
 
 
 @admin.register(FAQ)
@@ -92,6 +136,7 @@ class FAQAdmin(admin.ModelAdmin):
     list_filter = ['category', 'is_featured', 'technologies', 'is_active', 'created_at']
     search_fields = ['question', 'answer']
     list_editable = ['order', 'is_featured', 'is_active']
+    list_select_related = ['category']
     filter_horizontal = ['technologies']
     
     fieldsets = (
@@ -115,6 +160,11 @@ class FAQAdmin(admin.ModelAdmin):
     )
     
     readonly_fields = ['view_count']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'category', 'created_by'
+        ).prefetch_related('technologies')
 
 
 @admin.register(KnowledgeArticle)
@@ -123,6 +173,7 @@ class KnowledgeArticleAdmin(admin.ModelAdmin):
     list_filter = ['category', 'difficulty', 'status', 'technologies', 'is_active', 'created_at']
     search_fields = ['title', 'content', 'summary']
     list_editable = ['status']
+    list_select_related = ['category']
     prepopulated_fields = {'slug': ('title',)}
     filter_horizontal = ['technologies', 'tags']
     
@@ -147,19 +198,11 @@ class KnowledgeArticleAdmin(admin.ModelAdmin):
     )
     
     readonly_fields = ['view_count']
-
-
-# Inline admins for votes and views
-class QuestionVoteInline(admin.TabularInline):
-    model = QuestionVote
-    extra = 0
-    readonly_fields = ['user', 'is_helpful', 'created_at']
-
-
-class AnswerVoteInline(admin.TabularInline):
-    model = AnswerVote
-    extra = 0
-    readonly_fields = ['user', 'is_helpful', 'created_at']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'category', 'created_by'
+        ).prefetch_related('technologies', 'tags')
 
 
 @admin.register(QuestionView)
@@ -167,6 +210,9 @@ class QuestionViewAdmin(admin.ModelAdmin):
     list_display = ['question', 'user', 'viewed_at', 'ip_address']
     list_filter = ['viewed_at']
     search_fields = ['question__title', 'user__username']
+    list_select_related = ['question', 'user']
+    show_full_result_count = False
+    list_per_page = 50
     readonly_fields = ['question', 'user', 'viewed_at', 'ip_address']
 
 
@@ -175,6 +221,9 @@ class QuestionVoteAdmin(admin.ModelAdmin):
     list_display = ['question', 'user', 'is_helpful', 'created_at']
     list_filter = ['is_helpful', 'created_at']
     search_fields = ['question__title', 'user__username']
+    list_select_related = ['question', 'user']
+    show_full_result_count = False
+    list_per_page = 50
 
 
 @admin.register(AnswerVote)
@@ -182,3 +231,14 @@ class AnswerVoteAdmin(admin.ModelAdmin):
     list_display = ['answer', 'user', 'is_helpful', 'created_at']
     list_filter = ['is_helpful', 'created_at']
     search_fields = ['answer__question__title', 'user__username']
+    list_select_related = ['answer__question', 'user']
+    show_full_result_count = False
+    list_per_page = 50
+
+
+@admin.register(UserActivityStat)
+class UserActivityStatAdmin(admin.ModelAdmin):
+    list_display = ['user', 'question_count', 'answer_count', 'article_count', 'updated_at']
+    search_fields = ['user__username']
+    list_select_related = ['user']
+    readonly_fields = ['user', 'question_count', 'answer_count', 'article_count', 'updated_at']
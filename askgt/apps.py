@@ -5,3 +5,6 @@ class AskgtConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'askgt'
     verbose_name = 'AskGT Bilgi Bankası'
+
+    def ready(self):
+        import askgt.signals
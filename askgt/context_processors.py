@@ -3,57 +3,95 @@ from django.core.cache import cache
 from .models import AskGTDocument
 
 
-def askgt_categories(request):
-    """
-    Context processor to provide AskGT categories for dynamic menu generation
-    """
-    # Cache key for categories
-    cache_key = 'askgt_categories_menu'
-    categories = cache.get(cache_key)
-    
-    if categories is None:
-        # Aktif dokümanların kategorilerini say
-        categories = (
-            AskGTDocument.objects
-            .filter(is_active=True)
-            .values('kategori')
-            .annotate(count=Count('id'))
-            .order_by('kategori')
-        )
-        
-        # Cache'e 15 dakika boyunca sakla
-        cache.set(cache_key, list(categories), 60 * 15)
-    
-    return {
-        'askgt_categories': categories
+CATEGORIES_CACHE_KEY = 'askgt_categories_menu'
+STATS_CACHE_KEY = 'askgt_stats'
+STALE_CACHE_KEY = 'askgt_menu_last_good'
+REBUILD_LOCK_KEY = 'askgt_menu_rebuild_lock'
+DOCUMENT_LISTS_CACHE_KEY = 'askgt_dashboard_document_lists'
+
+# Cache sinyallerle geçersiz kılınır; TTL yalnızca güvenlik ağıdır
+MENU_CACHE_TIMEOUT = 60 * 60 * 6
+REBUILD_LOCK_TIMEOUT = 30
+
+
+def build_askgt_menu_data():
+    """
+    Kategori listesini hesapla ve istatistikleri bu listeden türet
+    """
+    # Cache'lenen nesne değişmez ve list'ten biraz daha küçük olsun diye tuple
+    categories = tuple(
+        AskGTDocument.objects
+        .filter(is_active=True)
+        .values('kategori')
+        .annotate(count=Count('id'))
+        .order_by('kategori')
+    )
+
+    # Kategori başına sayıların toplamı aktif doküman sayısına eşittir
+    stats = {
+        'total_documents': sum(category['count'] for category in categories),
+        'total_categories': len(categories),
     }
 
+    return categories, stats
+
+
+def refresh_askgt_menu_cache():
+    """
+    AskGT menü verisini yeniden hesapla ve cache'e yaz
+    """
+    categories, stats = build_askgt_menu_data()
+    cache.set_many({
+        CATEGORIES_CACHE_KEY: categories,
+        STATS_CACHE_KEY: stats,
+    }, MENU_CACHE_TIMEOUT)
+
+    # Yeniden oluşturma sırasında sunulacak son geçerli kopya (süresiz)
+    cache.set(STALE_CACHE_KEY, (categories, stats), None)
+
+    return categories, stats
+
+
+def invalidate_askgt_menu_cache():
+    """
+    AskGT menü cache'ini ve dokümanlardan türetilen dashboard listelerini temizle
+    """
+    cache.delete_many([CATEGORIES_CACHE_KEY, STATS_CACHE_KEY, DOCUMENT_LISTS_CACHE_KEY])
+
+
+def get_askgt_menu_data():
+    """
+    Kategori listesini ve istatistikleri cache'ten oku; gerekirse tek worker yeniden oluşturur
+    """
+    cached = cache.get_many([CATEGORIES_CACHE_KEY, STATS_CACHE_KEY])
+    categories = cached.get(CATEGORIES_CACHE_KEY)
+    stats = cached.get(STATS_CACHE_KEY)
+
+    if categories is None or stats is None:
+        # Aynı anda yalnızca bir worker cache'i yeniden oluşturur
+        if cache.add(REBUILD_LOCK_KEY, 1, REBUILD_LOCK_TIMEOUT):
+            try:
+                categories, stats = refresh_askgt_menu_cache()
+            finally:
+                cache.delete(REBUILD_LOCK_KEY)
+        else:
+            # Diğerleri son geçerli kopyayı sunar; hiç yoksa doğrudan hesaplar
+            stale = cache.get(STALE_CACHE_KEY)
+            if stale is not None:
+                categories, stats = stale
+            else:
+                categories, stats = build_askgt_menu_data()
+
+    return categories, stats
+
+
+def askgt_menu(request):
+    """
+    Context processor to provide AskGT categories and statistics for dynamic menu generation
+    """
+    categories, stats = get_askgt_menu_data()
 
-def askgt_stats(request):
-    """
-    Context processor to provide AskGT statistics
-    """
-    cache_key = 'askgt_stats'
-    stats = cache.get(cache_key)
-    
-    if stats is None:
-        total_documents = AskGTDocument.objects.filter(is_active=True).count()
-        total_categories = (
-            AskGTDocument.objects
-            .filter(is_active=True)
-            .values('kategori')
-            .distinct()
-            .count()
-        )
-        
-        stats = {
-            'total_documents': total_documents,
-            'total_categories': total_categories,
-        }
-        
-        # Cache'e 30 dakika boyunca sakla
-        cache.set(cache_key, stats, 60 * 30)
-    
     return {
-        'askgt_stats': stats
+        'askgt_categories': categories,
+        'askgt_stats': stats,
     }
@@ -0,0 +1,154 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.core.cache import cache
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+
+VIEW_COUNTER_PREFIX = 'askgt:views'
+QUESTION_VIEWERS_PREFIX = 'askgt:qv'
+
+# Tek UPDATE ... CASE ifadesinde birleştirilen en fazla satır sayısı
+FLUSH_BATCH_SIZE = 500
+
+# Bir kullanıcının aynı soruyu görmesi günde en fazla bir kez veritabanına yansır
+QUESTION_VIEWERS_TTL = 60 * 60 * 24
+
+# Toplu işlemler sırasında soru sinyallerinin sayaç yenilemesini bastırır
+_QUESTION_COUNTS_DEFERRED = ContextVar('askgt_question_counts_deferred', default=False)
+
+
+def _redis_client():
+    return cache._cache.get_client(write=True)
+
+
+def _view_counter_models():
+    from .models import AskGTDocument, KnowledgeArticle, Question
+    return {
+        'document': AskGTDocument,
+        'question': Question,
+        'article': KnowledgeArticle,
+    }
+
+
+def buffer_view(kind, pk):
+    """
+    Görüntülenmeyi Redis'te biriktir; veritabanına flush_view_counters yazar
+    """
+    # Redis INCR eksik anahtarı oluşturur; flush'taki GETDEL ile yarışta hata vermez
+    _redis_client().incr(cache.make_key(f'{VIEW_COUNTER_PREFIX}:{kind}:{pk}'))
+
+
+def record_question_view(question_id, user_id, ip_address=None):
+    """
+    Soru görüntülenmesini Redis SET'inde işaretle; yalnızca yeni ziyaretçi veritabanına yazılır
+    """
+    from .models import QuestionView
+
+    key = cache.make_key(f'{QUESTION_VIEWERS_PREFIX}:{question_id}')
+    pipe = _redis_client().pipeline()
+    pipe.sadd(key, user_id)
+    pipe.expire(key, QUESTION_VIEWERS_TTL)
+    added, _ = pipe.execute()
+    if not added:
+        return False
+
+    # SET süresi dolduktan sonra gelen ziyaret tekrar sayılmaz (question, user benzersiz)
+    _, created = QuestionView.objects.get_or_create(
+        question_id=question_id,
+        user_id=user_id,
+        defaults={'ip_address': ip_address}
+    )
+    if created:
+        buffer_view('question', question_id)
+    return created
+
+
+def flush_buffered_views():
+    """
+    Biriken görüntülenme sayılarını veritabanına yaz ve sayaçları sıfırla
+
+    Her model için satır başına ayrı UPDATE yerine CASE ifadeli toplu UPDATE kullanılır.
+    """
+    models = _view_counter_models()
+    client = _redis_client()
+    pattern = cache.make_key(f'{VIEW_COUNTER_PREFIX}:*')
+
+    deltas = {kind: {} for kind in models}
+    for raw_key in client.scan_iter(match=pattern, count=500):
+        # GETDEL okuma ve silmeyi atomik yapar; arada gelen artışlar kaybolmaz
+        delta = client.getdel(raw_key)
+        if not delta:
+            continue
+
+        kind, pk = raw_key.decode().rsplit(':', 2)[-2:]
+        if kind in deltas:
+            deltas[kind][int(pk)] = int(delta)
+
+    flushed = 0
+    for kind, pending in deltas.items():
+        items = list(pending.items())
+        for start in range(0, len(items), FLUSH_BATCH_SIZE):
+            chunk = items[start:start + FLUSH_BATCH_SIZE]
+            increment = Case(
+                *[When(pk=pk, then=Value(delta)) for pk, delta in chunk],
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+            models[kind].objects.filter(pk__in=[pk for pk, _ in chunk]).update(
+                view_count=F('view_count') + increment
+            )
+        flushed += len(items)
+
+    return flushed
+
+
+@contextmanager
+def deferred_question_counts():
+    """
+    Blok içindeki soru sinyallerinde sayaç yenilemeyi atla; çağıran blok sonunda kendisi yeniler
+    """
+    token = _QUESTION_COUNTS_DEFERRED.set(True)
+    try:
+        yield
+    finally:
+        _QUESTION_COUNTS_DEFERRED.reset(token)
+
+
+def question_counts_deferred():
+    return _QUESTION_COUNTS_DEFERRED.get()
+
+
+def refresh_question_counts(category_ids=None, technology_ids=None):
+    """
+    Kategori ve teknolojilerin onaylı soru sayılarını tek UPDATE ile yeniden hesapla
+
+    None verilen taraf için tüm kayıtlar, boş küme verilen taraf için hiçbiri güncellenir.
+    """
+    from .models import KnowledgeCategory, Question, Technology
+
+    approved = Question.objects.filter(status='approved', is_active=True).order_by()
+
+    if category_ids is None or category_ids:
+        per_category = (
+            approved.filter(category=OuterRef('pk'))
+            .values('category')
+            .annotate(count=Count('id'))
+            .values('count')
+        )
+        categories = KnowledgeCategory.objects.all()
+        if category_ids is not None:
+            categories = categories.filter(pk__in=category_ids)
+        categories.update(approved_question_count=Coalesce(Subquery(per_category), 0))
+
+    if technology_ids is None or technology_ids:
+        per_technology = (
+            approved.filter(technologies=OuterRef('pk'))
+            .values('technologies')
+            .annotate(count=Count('id'))
+            .values('count')
+        )
+        technologies = Technology.objects.all()
+        if technology_ids is not None:
+            technologies = technologies.filter(pk__in=technology_ids)
+        technologies.update(approved_question_count=Coalesce(Subquery(per_technology), 0))
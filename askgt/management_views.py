@@ -1,18 +1,46 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponseForbidden
-from django.core.paginator import Paginator
-from django.db.models import Q, Count, Avg
+from django.http import Http404, JsonResponse, HttpResponseForbidden
+from django.core.cache import cache
+from django.db.models import Q, Count, Avg, F, Prefetch
 from django.utils import timezone
 from django.views.decorators.http import require_http_methods
-from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.csrf import csrf_protect
+from celery.result import AsyncResult
 from .models import (
     Question, Answer, KnowledgeCategory, Technology, FAQ, 
-    KnowledgeArticle, QuestionVote, AnswerVote
+    KnowledgeArticle, QuestionVote, AnswerVote, UserActivityStat
 )
 from django.contrib.auth.models import User
-import json
+from core.paginator import FastCountPaginator
+from .search import apply_text_search
+from .tasks import BULK_ACTIONS, BULK_ITEM_TYPES, apply_bulk_action
+from .versioned_cache import bump_cache_version
+import orjson
+
+
+DASHBOARD_STATS_CACHE_KEY = 'askgt:dash:stats'
+DASHBOARD_ACTIVITY_CACHE_KEY = 'askgt:dash:recent'
+DASHBOARD_CACHE_TIMEOUT = 60
+
+BULK_ACTION_MAX_BODY = 1_000_000
+BULK_ACTION_MAX_ITEMS = 10_000
+
+# Durum seçenekleri modül yüklenirken bir kez okunur
+QUESTION_STATUS_CHOICES = tuple(Question._meta.get_field('status').choices)
+QUESTION_STATUSES = frozenset(value for value, _ in QUESTION_STATUS_CHOICES)
+ARTICLE_STATUS_CHOICES = tuple(KnowledgeArticle._meta.get_field('status').choices)
+ARTICLE_STATUSES = frozenset(value for value, _ in ARTICLE_STATUS_CHOICES)
+
+# Liste görünümlerinde teknoloji etiketleri için yalnızca gereken kolonlar
+TECHNOLOGY_CHIPS_PREFETCH = Prefetch('technologies', queryset=Technology.objects.only('id', 'name', 'color'))
+
+# Liste görünümlerinde izin verilen sıralamalar (indeksli kolonlar)
+QUESTION_SORTS = frozenset({'-created_at', 'created_at', '-view_count', 'title', '-title'})
+ANSWER_SORTS = frozenset({'-created_at', 'created_at'})
+ARTICLE_SORTS = frozenset({'-created_at', 'created_at', '-published_at', '-view_count', 'title', '-title'})
+FAQ_SORTS = frozenset({'order', '-order', '-created_at', 'created_at'})
 
 
 def is_askgt_manager(user):
@@ -20,23 +48,39 @@ def is_askgt_manager(user):
     return user.is_staff or user.groups.filter(name='AskGT Yöneticileri').exists()
 
 
-@login_required
-@user_passes_test(is_askgt_manager)
-def askgt_management_dashboard(request):
-    """AskGT yönetim ana sayfası"""
-    # İstatistikler
+def _build_dashboard_stats():
+    """Dashboard istatistiklerini hesapla"""
+    # İstatistikler (model başına tek aggregate sorgusu)
+    question_stats = Question.objects.aggregate(
+        total=Count('id'),
+        answered=Count('id', filter=Q(answer_count__gt=0)),
+        pending=Count('id', filter=Q(status='pending')),
+    )
+    answer_stats = Answer.objects.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='draft')),
+    )
+    article_stats = KnowledgeArticle.objects.aggregate(
+        total=Count('id'),
+        published=Count('id', filter=Q(status='published')),
+    )
+    faq_stats = FAQ.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+    )
+    
     stats = {
-        'total_questions': Question.objects.count(),
-        'answered_questions': Question.objects.filter(answers__isnull=False).distinct().count(),
-        'total_answers': Answer.objects.count(),
-        'total_articles': KnowledgeArticle.objects.count(),
-        'published_articles': KnowledgeArticle.objects.filter(status='published').count(),
-        'total_faqs': FAQ.objects.count(),
-        'active_faqs': FAQ.objects.filter(is_active=True).count(),
+        'total_questions': question_stats['total'],
+        'answered_questions': question_stats['answered'],
+        'total_answers': answer_stats['total'],
+        'total_articles': article_stats['total'],
+        'published_articles': article_stats['published'],
+        'total_faqs': faq_stats['total'],
+        'active_faqs': faq_stats['active'],
         'total_categories': KnowledgeCategory.objects.count(),
         'total_technologies': Technology.objects.count(),
-        'pending_questions': Question.objects.filter(status='pending').count(),
-        'pending_answers': Answer.objects.filter(is_approved=False).count(),
+        'pending_questions': question_stats['pending'],
+        'pending_answers': answer_stats['pending'],
     }
     
     # Cevap oranı
@@ -45,6 +89,11 @@ def askgt_management_dashboard(request):
     else:
         stats['answer_rate'] = 0
     
+    return stats
+
+
+def _build_dashboard_activity():
+    """Dashboard aktivite listelerini hesapla"""
     # Son aktiviteler
     recent_questions = Question.objects.select_related(
         'author', 'category'
@@ -54,13 +103,8 @@ def askgt_management_dashboard(request):
         'author', 'question'
     ).order_by('-created_at')[:10]
     
-    # En aktif kullanıcılar
-    active_users = User.objects.annotate(
-        question_count=Count('questions'),
-        answer_count=Count('answers')
-    ).filter(
-        Q(question_count__gt=0) | Q(answer_count__gt=0)
-    ).order_by('-question_count', '-answer_count')[:10]
+    # En aktif kullanıcılar (saatlik snapshot tablosundan)
+    active_users = _active_users_from_snapshot()[:10]
     
     # Popüler sorular
     popular_questions = Question.objects.filter(
@@ -69,16 +113,44 @@ def askgt_management_dashboard(request):
     
     # Bekleyen onaylar
     pending_answers = Answer.objects.filter(
-        is_approved=False
+        status='draft'
     ).select_related('author', 'question')[:5]
     
+    # Cache'e konabilmesi için listeler halinde döndür
+    return {
+        'recent_questions': list(recent_questions),
+        'recent_answers': list(recent_answers),
+        'active_users': list(active_users),
+        'popular_questions': list(popular_questions),
+        'pending_answers': list(pending_answers),
+    }
+
+
+def _active_users_from_snapshot():
+    """Katkı sayıları snapshot tablosundan okunan, sıralı kullanıcılar"""
+    return User.objects.filter(askgt_activity__isnull=False).annotate(
+        question_count=F('askgt_activity__question_count'),
+        answer_count=F('askgt_activity__answer_count'),
+        article_count=F('askgt_activity__article_count'),
+    ).order_by('-question_count', '-answer_count', '-article_count')
+
+
+def invalidate_dashboard_cache():
+    """Yönetim dashboard cache'ini ve sürümlü ana sayfa bloklarını temizle"""
+    cache.delete_many([DASHBOARD_STATS_CACHE_KEY, DASHBOARD_ACTIVITY_CACHE_KEY])
+    bump_cache_version()
+
+
+@login_required
+@user_passes_test(is_askgt_manager)
+def askgt_management_dashboard(request):
+    """AskGT yönetim ana sayfası"""
+    stats = cache.get_or_set(DASHBOARD_STATS_CACHE_KEY, _build_dashboard_stats, DASHBOARD_CACHE_TIMEOUT)
+    activity = cache.get_or_set(DASHBOARD_ACTIVITY_CACHE_KEY, _build_dashboard_activity, DASHBOARD_CACHE_TIMEOUT)
+    
     context = {
         'stats': stats,
-        'recent_questions': recent_questions,
-        'recent_answers': recent_answers,
-        'active_users': active_users,
-        'popular_questions': popular_questions,
-        'pending_answers': pending_answers,
+        **activity,
     }
     
     return render(request, 'askgt/management/dashboard.html', context)
@@ -88,7 +160,10 @@ def askgt_management_dashboard(request):
 @user_passes_test(is_askgt_manager)
 def question_management(request):
     """Soru yönetimi"""
-    questions = Question.objects.select_related('author', 'category').prefetch_related('technologies')
+    # Liste sayfasında gösterilmeyen TEXT kolonları çekilmez
+    questions = Question.objects.select_related('author', 'category').prefetch_related(
+        TECHNOLOGY_CHIPS_PREFETCH
+    ).defer('content')
     
     # Filtreleme
     status = request.GET.get('status')
@@ -105,16 +180,16 @@ def question_management(request):
     
     search = request.GET.get('search')
     if search:
-        questions = questions.filter(
-            Q(title__icontains=search) | Q(content__icontains=search)
-        )
+        questions = apply_text_search(questions, search, ['title', 'content'])
     
     # Sıralama
     sort_by = request.GET.get('sort', '-created_at')
+    if sort_by not in QUESTION_SORTS:
+        sort_by = '-created_at'
     questions = questions.order_by(sort_by)
     
     # Sayfalama
-    paginator = Paginator(questions, 25)
+    paginator = FastCountPaginator(questions, 25)
     page = request.GET.get('page')
     questions = paginator.get_page(page)
     
@@ -126,7 +201,7 @@ def question_management(request):
         'questions': questions,
         'categories': categories,
         'technologies': technologies,
-        'status_choices': Question._meta.get_field('status').choices,
+        'status_choices': QUESTION_STATUS_CHOICES,
         'filters': {
             'status': status,
             'category': category_id,
@@ -144,15 +219,18 @@ def question_management(request):
 def question_detail_management(request, question_id):
     """Soru detay yönetimi"""
     question = get_object_or_404(
-        Question.objects.select_related('author', 'category').prefetch_related('technologies'),
+        Question.objects.select_related('author', 'category').prefetch_related(
+            'technologies',
+            Prefetch('votes', queryset=QuestionVote.objects.select_related('user')),
+        ),
         id=question_id
     )
     
     # Cevaplar
-    answers = question.answers.select_related('author').order_by('-created_at')
+    answers = list(question.answers.select_related('author').order_by('-created_at'))
     
-    # Oylar
-    question_votes = question.votes.select_related('user')
+    # Oylar (prefetch edilmiş listeden)
+    question_votes = question.votes.all()
     answer_votes = AnswerVote.objects.filter(
         answer__question=question
     ).select_related('user', 'answer')
@@ -160,9 +238,9 @@ def question_detail_management(request, question_id):
     # İstatistikler
     stats = {
         'view_count': question.view_count,
-        'answer_count': answers.count(),
-        'upvotes': question_votes.filter(vote_type='up').count(),
-        'downvotes': question_votes.filter(vote_type='down').count(),
+        'answer_count': question.answer_count,
+        'upvotes': question.helpful_count,
+        'downvotes': question.not_helpful_count,
         'days_since_created': (timezone.now() - question.created_at).days,
     }
     
@@ -185,9 +263,10 @@ def update_question_status(request, question_id):
     question = get_object_or_404(Question, id=question_id)
     
     new_status = request.POST.get('status')
-    if new_status in dict(Question._meta.get_field('status').choices):
+    if new_status in QUESTION_STATUSES:
         question.status = new_status
         question.save()
+        invalidate_dashboard_cache()
         
         messages.success(request, f'Soru durumu "{question.get_status_display()}" olarak güncellendi.')
     else:
@@ -200,14 +279,18 @@ def update_question_status(request, question_id):
 @user_passes_test(is_askgt_manager)
 def answer_management(request):
     """Cevap yönetimi"""
-    answers = Answer.objects.select_related('author', 'question')
+    # Liste sayfasında gösterilmeyen TEXT kolonları çekilmez
+    answers = Answer.objects.select_related('author', 'question').defer(
+        'content', 'code_example', 'question__content'
+    )
     
     # Filtreleme
     is_approved = request.GET.get('approved')
+    # Answer'da onay alanı yok; onaylı = yayında, bekleyen = taslak
     if is_approved == '1':
-        answers = answers.filter(is_approved=True)
+        answers = answers.filter(status='published')
     elif is_approved == '0':
-        answers = answers.filter(is_approved=False)
+        answers = answers.filter(status='draft')
     
     is_accepted = request.GET.get('accepted')
     if is_accepted == '1':
@@ -217,16 +300,19 @@ def answer_management(request):
     
     search = request.GET.get('search')
     if search:
-        answers = answers.filter(
-            Q(content__icontains=search) | Q(question__title__icontains=search)
+        answers = apply_text_search(
+            answers, search, ['content'],
+            extra=Q(question__title__icontains=search)
         )
     
     # Sıralama
     sort_by = request.GET.get('sort', '-created_at')
+    if sort_by not in ANSWER_SORTS:
+        sort_by = '-created_at'
     answers = answers.order_by(sort_by)
     
     # Sayfalama
-    paginator = Paginator(answers, 25)
+    paginator = FastCountPaginator(answers, 25)
     page = request.GET.get('page')
     answers = paginator.get_page(page)
     
@@ -248,12 +334,11 @@ def answer_management(request):
 @require_http_methods(["POST"])
 def approve_answer(request, answer_id):
     """Cevabı onayla"""
-    answer = get_object_or_404(Answer, id=answer_id)
-    
-    answer.is_approved = True
-    answer.approved_by = request.user
-    answer.approved_at = timezone.now()
-    answer.save()
+    # Answer'da onay alanları yok; onay yayın durumuna eşlenir
+    updated = Answer.objects.filter(pk=answer_id).update(status='published')
+    if not updated:
+        raise Http404
+    invalidate_dashboard_cache()
     
     messages.success(request, 'Cevap onaylandı.')
     
@@ -265,10 +350,10 @@ def approve_answer(request, answer_id):
 @require_http_methods(["POST"])
 def reject_answer(request, answer_id):
     """Cevabı reddet"""
-    answer = get_object_or_404(Answer, id=answer_id)
-    
-    answer.is_approved = False
-    answer.save()
+    updated = Answer.objects.filter(pk=answer_id).update(status='draft')
+    if not updated:
+        raise Http404
+    invalidate_dashboard_cache()
     
     messages.success(request, 'Cevap reddedildi.')
     
@@ -279,7 +364,10 @@ def reject_answer(request, answer_id):
 @user_passes_test(is_askgt_manager)
 def article_management(request):
     """Makale yönetimi"""
-    articles = KnowledgeArticle.objects.select_related('author', 'category').prefetch_related('technologies')
+    # Liste sayfasında gösterilmeyen TEXT kolonları çekilmez
+    articles = KnowledgeArticle.objects.select_related('author', 'category').prefetch_related(
+        TECHNOLOGY_CHIPS_PREFETCH
+    ).defer('content', 'summary')
     
     # Filtreleme
     status = request.GET.get('status')
@@ -292,16 +380,16 @@ def article_management(request):
     
     search = request.GET.get('search')
     if search:
-        articles = articles.filter(
-            Q(title__icontains=search) | Q(content__icontains=search)
-        )
+        articles = apply_text_search(articles, search, ['title', 'summary', 'content'])
     
     # Sıralama
     sort_by = request.GET.get('sort', '-created_at')
+    if sort_by not in ARTICLE_SORTS:
+        sort_by = '-created_at'
     articles = articles.order_by(sort_by)
     
     # Sayfalama
-    paginator = Paginator(articles, 25)
+    paginator = FastCountPaginator(articles, 25)
     page = request.GET.get('page')
     articles = paginator.get_page(page)
     
@@ -311,7 +399,7 @@ def article_management(request):
     context = {
         'articles': articles,
         'categories': categories,
-        'status_choices': KnowledgeArticle._meta.get_field('status').choices,
+        'status_choices': ARTICLE_STATUS_CHOICES,
         'filters': {
             'status': status,
             'category': category_id,
@@ -331,11 +419,12 @@ def update_article_status(request, article_id):
     article = get_object_or_404(KnowledgeArticle, id=article_id)
     
     new_status = request.POST.get('status')
-    if new_status in dict(KnowledgeArticle._meta.get_field('status').choices):
+    if new_status in ARTICLE_STATUSES:
         article.status = new_status
         if new_status == 'published':
             article.published_at = timezone.now()
         article.save()
+        invalidate_dashboard_cache()
         
         messages.success(request, f'Makale durumu "{article.get_status_display()}" olarak güncellendi.')
     else:
@@ -348,7 +437,8 @@ def update_article_status(request, article_id):
 @user_passes_test(is_askgt_manager)
 def faq_management(request):
     """SSS yönetimi"""
-    faqs = FAQ.objects.select_related('category')
+    # Liste sayfasında gösterilmeyen TEXT kolonları çekilmez
+    faqs = FAQ.objects.select_related('category').defer('answer')
     
     # Filtreleme
     is_active = request.GET.get('active')
@@ -363,16 +453,16 @@ def faq_management(request):
     
     search = request.GET.get('search')
     if search:
-        faqs = faqs.filter(
-            Q(question__icontains=search) | Q(answer__icontains=search)
-        )
+        faqs = apply_text_search(faqs, search, ['question', 'answer'])
     
     # Sıralama
     sort_by = request.GET.get('sort', 'order')
+    if sort_by not in FAQ_SORTS:
+        sort_by = 'order'
     faqs = faqs.order_by(sort_by)
     
     # Sayfalama
-    paginator = Paginator(faqs, 25)
+    paginator = FastCountPaginator(faqs, 25)
     page = request.GET.get('page')
     faqs = paginator.get_page(page)
     
@@ -430,26 +520,33 @@ def technology_management(request):
 @user_passes_test(is_askgt_manager)
 def user_statistics(request):
     """Kullanıcı istatistikleri"""
-    # En aktif kullanıcılar
-    active_users = User.objects.annotate(
-        question_count=Count('questions'),
-        answer_count=Count('answers'),
-        article_count=Count('knowledgearticles')
-    ).filter(
-        Q(question_count__gt=0) | Q(answer_count__gt=0) | Q(article_count__gt=0)
-    ).order_by('-question_count', '-answer_count', '-article_count')
+    # En aktif kullanıcılar (saatlik snapshot tablosundan)
+    active_users = _active_users_from_snapshot()
+    
+    # Sayı ve ortalamalar tek aggregate sorgusunda hesaplanır
+    summary = UserActivityStat.objects.aggregate(
+        total=Count('id'),
+        avg_questions=Avg('question_count'),
+        avg_answers=Avg('answer_count'),
+    )
     
     # Sayfalama
-    paginator = Paginator(active_users, 25)
+    paginator = FastCountPaginator(active_users, 25, count=summary['total'])
     page = request.GET.get('page')
     users = paginator.get_page(page)
     
+    # İlk sayfadaki ilk kullanıcı zaten en çok soru soranıdır
+    if users.number == 1:
+        top_questioner = users.object_list[0] if users.object_list else None
+    else:
+        top_questioner = active_users.first()
+    
     # Genel istatistikler
     stats = {
-        'total_contributors': active_users.count(),
-        'avg_questions_per_user': active_users.aggregate(Avg('question_count'))['question_count__avg'] or 0,
-        'avg_answers_per_user': active_users.aggregate(Avg('answer_count'))['answer_count__avg'] or 0,
-        'top_questioner': active_users.first() if active_users.exists() else None,
+        'total_contributors': summary['total'],
+        'avg_questions_per_user': summary['avg_questions'] or 0,
+        'avg_answers_per_user': summary['avg_answers'] or 0,
+        'top_questioner': top_questioner,
     }
     
     context = {
@@ -462,61 +559,52 @@ def user_statistics(request):
 
 @login_required
 @user_passes_test(is_askgt_manager)
-@csrf_exempt
+@csrf_protect
 @require_http_methods(["POST"])
 def bulk_action(request):
     """Toplu işlemler"""
+    if len(request.body) > BULK_ACTION_MAX_BODY:
+        return JsonResponse({'success': False, 'error': 'İstek çok büyük'}, status=413)
+    
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         action = data.get('action')
         item_type = data.get('item_type')  # question, answer, article, faq
-        item_ids = data.get('item_ids', [])
+        # IN listesi boyutu sınırlanır ki Postgres planı makul kalsın
+        item_ids = [int(item_id) for item_id in data.get('item_ids', [])[:BULK_ACTION_MAX_ITEMS]]
         
         if not action or not item_type or not item_ids:
             return JsonResponse({'success': False, 'error': 'Geçersiz parametreler'})
         
-        count = 0
-        
-        if item_type == 'question':
-            items = Question.objects.filter(id__in=item_ids)
-            
-            if action == 'approve':
-                items.update(status='approved')
-                count = items.count()
-                message = f'{count} soru onaylandı'
-            elif action == 'reject':
-                items.update(status='rejected')
-                count = items.count()
-                message = f'{count} soru reddedildi'
-            elif action == 'delete':
-                count = items.count()
-                items.delete()
-                message = f'{count} soru silindi'
-            else:
-                return JsonResponse({'success': False, 'error': 'Geçersiz işlem'})
+        if item_type not in BULK_ITEM_TYPES:
+            return JsonResponse({'success': False, 'error': 'Desteklenmeyen öğe türü'})
         
-        elif item_type == 'answer':
-            items = Answer.objects.filter(id__in=item_ids)
-            
-            if action == 'approve':
-                items.update(is_approved=True, approved_by=request.user, approved_at=timezone.now())
-                count = items.count()
-                message = f'{count} cevap onaylandı'
-            elif action == 'reject':
-                items.update(is_approved=False)
-                count = items.count()
-                message = f'{count} cevap reddedildi'
-            elif action == 'delete':
-                count = items.count()
-                items.delete()
-                message = f'{count} cevap silindi'
-            else:
-                return JsonResponse({'success': False, 'error': 'Geçersiz işlem'})
+        if action not in BULK_ACTIONS:
+            return JsonResponse({'success': False, 'error': 'Geçersiz işlem'})
         
-        else:
-            return JsonResponse({'success': False, 'error': 'Desteklenmeyen öğe türü'})
+        # Güncellemeler Celery'de parçalar halinde uygulanır, istemci durumu sorgular
+        task = apply_bulk_action.delay(action, item_type, item_ids, request.user.id)
         
-        return JsonResponse({'success': True, 'message': message})
+        return JsonResponse({
+            'success': True,
+            'task_id': task.id,
+            'message': 'Toplu işlem kuyruğa alındı',
+        })
         
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)})
+
+
+@login_required
+@user_passes_test(is_askgt_manager)
+def bulk_action_status(request, task_id):
+    """Toplu işlem durumunu sorgula"""
+    result = AsyncResult(task_id)
+    
+    response = {'task_id': task_id, 'state': result.state}
+    if result.successful():
+        response.update(result.result)
+    elif result.failed():
+        response['error'] = str(result.result)
+    
+    return JsonResponse(response)
@@ -1,7 +1,11 @@
+from hashlib import blake2b
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.db.models.functions import Upper
 from core.models import BaseModel, Category, Tag
 from django.contrib.auth.models import User
 from django.urls import reverse
+from .search import search_vector
 
 
 class KnowledgeCategory(BaseModel):
@@ -12,6 +16,9 @@ class KnowledgeCategory(BaseModel):
     icon = models.CharField(max_length=50, blank=True, help_text='CSS icon class')
     parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='children')
     order = models.PositiveIntegerField(default=0)
+    approved_question_count = models.PositiveIntegerField(
+        default=0, db_index=True, help_text='Onaylı soru sayısı (sinyallerle güncellenir)'
+    )
     
     class Meta:
         ordering = ['order', 'name']
@@ -31,6 +38,9 @@ class Technology(BaseModel):
     description = models.TextField(blank=True)
     color = models.CharField(max_length=7, default='#6c757d')
     icon = models.CharField(max_length=50, blank=True)
+    approved_question_count = models.PositiveIntegerField(
+        default=0, db_index=True, help_text='Onaylı soru sayısı (sinyallerle güncellenir)'
+    )
     
     class Meta:
         ordering = ['name']
@@ -77,6 +87,7 @@ class Question(BaseModel):
     view_count = models.PositiveIntegerField(default=0)
     helpful_count = models.PositiveIntegerField(default=0)
     not_helpful_count = models.PositiveIntegerField(default=0)
+    answer_count = models.PositiveIntegerField(default=0, help_text='Cevap sayısı (sinyallerle güncellenir)')
     
     # Approval workflow
     approved_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='approved_questions')
@@ -86,6 +97,13 @@ class Question(BaseModel):
         ordering = ['-created_at']
         verbose_name = 'Soru'
         verbose_name_plural = 'Sorular'
+        indexes = [
+            models.Index(fields=['status', '-created_at'], name='q_status_created'),
+            models.Index(fields=['category', '-created_at'], name='q_category_created'),
+            GinIndex(search_vector('title', 'content'), name='q_search_gin'),
+            GinIndex(fields=['title'], name='q_title_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['content'], name='q_content_trgm', opclasses=['gin_trgm_ops']),
+        ]
     
     def __str__(self):
         return self.title
@@ -129,6 +147,12 @@ class Answer(BaseModel):
         ordering = ['-is_accepted', '-is_official', '-helpful_count', '-created_at']
         verbose_name = 'Cevap'
         verbose_name_plural = 'Cevaplar'
+        indexes = [
+            models.Index(fields=['status', '-created_at'], name='a_status_created'),
+            models.Index(fields=['is_accepted', 'question'], name='a_accepted_question'),
+            GinIndex(search_vector('content'), name='a_search_gin'),
+            GinIndex(fields=['content'], name='a_content_trgm', opclasses=['gin_trgm_ops']),
+        ]
     
     def __str__(self):
         return f"Cevap: {self.question.title[:50]}..."
@@ -198,6 +222,12 @@ class FAQ(BaseModel):
         ordering = ['order', '-created_at']
         verbose_name = 'Sık Sorulan Soru'
         verbose_name_plural = 'Sık Sorulan Sorular'
+        indexes = [
+            models.Index(fields=['is_active', 'order'], name='faq_active_order'),
+            GinIndex(search_vector('question', 'answer'), name='faq_search_gin'),
+            GinIndex(fields=['question'], name='faq_question_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['answer'], name='faq_answer_trgm', opclasses=['gin_trgm_ops']),
+        ]
     
     def __str__(self):
         return self.question
@@ -210,6 +240,7 @@ class AskGTDocument(BaseModel):
     kategori = models.CharField(max_length=100, help_text='Doküman kategorisi', db_index=True)
     ozet = models.TextField(blank=True, help_text='Doküman özeti')
     kaynak_id = models.CharField(max_length=100, unique=True, help_text='Harici API\'den gelen benzersiz ID')
+    content_hash = models.CharField(max_length=32, blank=True, db_index=True, help_text='Senkronize edilen alanların özeti')
     eklenme_tarihi = models.DateTimeField(auto_now_add=True)
     guncelleme_tarihi = models.DateTimeField(auto_now=True)
     view_count = models.PositiveIntegerField(default=0)
@@ -221,7 +252,10 @@ class AskGTDocument(BaseModel):
         verbose_name_plural = 'AskGT Dokümanları'
         indexes = [
             models.Index(fields=['kategori', '-eklenme_tarihi']),
-            models.Index(fields=['kaynak_id']),
+            models.Index(fields=['is_active', 'kategori'], name='askgt_active_kat_idx'),
+            # PostgreSQL'de kategori__iexact UPPER(kategori) = UPPER(...) olarak derlenir
+            models.Index(Upper('kategori'), name='askgt_doc_kategori_upper'),
+            models.Index(fields=['is_active', 'view_count', 'eklenme_tarihi'], name='askgt_doc_cleanup_idx'),
         ]
     
     def __str__(self):
@@ -230,10 +264,16 @@ class AskGTDocument(BaseModel):
     def get_absolute_url(self):
         return reverse('askgt:document_redirect', kwargs={'document_id': self.id})
     
+    @staticmethod
+    def build_content_hash(baslik, orijinal_url, kategori, ozet):
+        """Senkronize edilen alanlardan değişiklik tespiti için özet üret"""
+        payload = f"{baslik}|{orijinal_url}|{kategori}|{ozet}".encode()
+        return blake2b(payload, digest_size=16).hexdigest()
+    
     def increment_view_count(self):
-        """Görüntülenme sayısını artır"""
-        self.view_count += 1
-        self.save(update_fields=['view_count'])
+        """Görüntülenme sayısını artır (Redis'te biriktirilir, periyodik olarak yazılır)"""
+        from .counters import buffer_view
+        buffer_view('document', self.pk)
 
 
 class KnowledgeArticle(BaseModel):
@@ -272,9 +312,35 @@ class KnowledgeArticle(BaseModel):
         ordering = ['-published_at', '-created_at']
         verbose_name = 'Bilgi Makalesi'
         verbose_name_plural = 'Bilgi Makaleleri'
+        indexes = [
+            models.Index(fields=['status', '-published_at'], name='ka_status_published'),
+            GinIndex(search_vector('title', 'summary', 'content'), name='ka_search_gin'),
+            GinIndex(fields=['title'], name='ka_title_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['summary'], name='ka_summary_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['content'], name='ka_content_trgm', opclasses=['gin_trgm_ops']),
+        ]
     
     def __str__(self):
         return self.title
     
     def get_absolute_url(self):
         return reverse('askgt:article_detail', kwargs={'slug': self.slug})
+
+
+class UserActivityStat(models.Model):
+    """Hourly snapshot of per-user AskGT contribution counts"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='askgt_activity')
+    question_count = models.PositiveIntegerField(default=0)
+    answer_count = models.PositiveIntegerField(default=0)
+    article_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Kullanıcı Aktivite İstatistiği'
+        verbose_name_plural = 'Kullanıcı Aktivite İstatistikleri'
+        indexes = [
+            models.Index(fields=['-question_count', '-answer_count', '-article_count'], name='uas_ranking'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.username} aktivite"
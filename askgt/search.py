@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db.models import Q
+
+
+# Modellerdeki GIN ifade indeksleriyle birebir aynı olmalı
+SEARCH_CONFIG = 'simple'
+MIN_FULL_TEXT_LENGTH = 3
+
+
+def search_vector(*fields):
+    """GIN indeksiyle eşleşen tsvector ifadesi"""
+    return SearchVector(*fields, config=SEARCH_CONFIG)
+
+
+def full_text_search_enabled():
+    """Kelime bazlı (kök bulmasız) arama anlamı ürün tarafından kabul edildiyse açılır"""
+    return getattr(settings, 'ASKGT_FULL_TEXT_SEARCH', False)
+
+
+def apply_text_search(queryset, search, fields, extra=None):
+    """
+    Alt dize (icontains) araması uygula; ILIKE taramalarını gin_trgm_ops indeksleri karşılar.
+    ASKGT_FULL_TEXT_SEARCH açıksa uzun terimler GIN indeksli full-text aramaya gider.
+    """
+    if full_text_search_enabled() and len(search) >= MIN_FULL_TEXT_LENGTH:
+        queryset = queryset.annotate(search_vector=search_vector(*fields))
+        condition = Q(search_vector=SearchQuery(search, config=SEARCH_CONFIG))
+    else:
+        condition = Q()
+        for field in fields:
+            condition |= Q(**{f'{field}__icontains': search})
+
+    if extra is not None:
+        condition |= extra
+
+    return queryset.filter(condition)
@@ -0,0 +1,106 @@
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_delete, pre_save
+from django.dispatch import receiver
+from .models import AskGTDocument, Answer, KnowledgeCategory, Question, Technology
+from .context_processors import invalidate_askgt_menu_cache
+from .counters import question_counts_deferred, refresh_question_counts
+from .versioned_cache import bump_cache_version, bump_filter_options_version
+
+# Bu alanlar değiştiğinde kategori/teknoloji soru sayıları etkilenmez
+QUESTION_COUNTER_FIELDS = frozenset({
+    'view_count', 'helpful_count', 'not_helpful_count', 'answer_count'
+})
+
+
+@receiver(post_save, sender=AskGTDocument)
+def invalidate_askgt_menu_on_save(sender, instance, update_fields=None, **kwargs):
+    """Invalidate AskGT menu cache when a document is saved"""
+    # Sadece görüntülenme sayacı güncellendiyse menü değişmez
+    if update_fields is not None and set(update_fields) == {'view_count'}:
+        return
+    invalidate_askgt_menu_cache()
+
+
+@receiver(post_delete, sender=AskGTDocument)
+def invalidate_askgt_menu_on_delete(sender, instance, **kwargs):
+    """Invalidate AskGT menu cache when a document is deleted"""
+    invalidate_askgt_menu_cache()
+
+
+@receiver(post_save, sender=Answer)
+def increment_question_answer_count(sender, instance, created, **kwargs):
+    """Keep Question.answer_count in sync when an answer is created"""
+    if created:
+        Question.objects.filter(pk=instance.question_id).update(answer_count=F('answer_count') + 1)
+
+
+@receiver(post_delete, sender=Answer)
+def decrement_question_answer_count(sender, instance, **kwargs):
+    """Keep Question.answer_count in sync when an answer is deleted"""
+    Question.objects.filter(pk=instance.question_id, answer_count__gt=0).update(
+        answer_count=F('answer_count') - 1
+    )
+
+
+@receiver(pre_save, sender=Question)
+def remember_question_category(sender, instance, update_fields=None, **kwargs):
+    """Remember the stored category so a move can refresh both categories"""
+    if instance.pk is None or (update_fields is not None and set(update_fields) <= QUESTION_COUNTER_FIELDS):
+        return
+    if question_counts_deferred():
+        return
+    instance._previous_category_id = (
+        Question.objects.filter(pk=instance.pk).values_list('category_id', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Question)
+def refresh_counts_on_question_save(sender, instance, update_fields=None, **kwargs):
+    """Keep approved question counts of categories and technologies in sync"""
+    if update_fields is not None and set(update_fields) <= QUESTION_COUNTER_FIELDS:
+        return
+    if question_counts_deferred():
+        return
+    category_ids = {instance.category_id, getattr(instance, '_previous_category_id', None)} - {None}
+    technology_ids = set(instance.technologies.values_list('id', flat=True))
+    refresh_question_counts(category_ids, technology_ids)
+
+
+@receiver(pre_delete, sender=Question)
+def remember_question_technologies(sender, instance, **kwargs):
+    """Remember the technologies before the M2M rows are removed by the delete"""
+    if question_counts_deferred():
+        return
+    instance._technology_ids = set(instance.technologies.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Question)
+def refresh_counts_on_question_delete(sender, instance, **kwargs):
+    """Keep approved question counts in sync when a question is deleted"""
+    if question_counts_deferred():
+        return
+    refresh_question_counts({instance.category_id}, getattr(instance, '_technology_ids', set()))
+
+
+@receiver(m2m_changed, sender=Question.technologies.through)
+def refresh_counts_on_question_technologies(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep technology counts in sync when question technologies change"""
+    if action not in ('post_add', 'post_remove', 'post_clear') or question_counts_deferred():
+        return
+    if reverse:
+        # technology.question_set değişti; instance teknolojinin kendisi
+        technology_ids = {instance.pk}
+    elif action == 'post_clear':
+        # clear() sonrası hangi teknolojilerin etkilendiği bilinmiyor
+        technology_ids = None
+    else:
+        technology_ids = pk_set
+    refresh_question_counts(set(), technology_ids)
+
+
+@receiver([post_save, post_delete], sender=KnowledgeCategory)
+@receiver([post_save, post_delete], sender=Technology)
+def bump_cache_version_on_filter_option_change(sender, **kwargs):
+    """Invalidate cached filter options and home blocks when categories/technologies change"""
+    bump_filter_options_version()
+    bump_cache_version()
@@ -0,0 +1,180 @@
+import ijson
+import requests
+import logging
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from .context_processors import invalidate_askgt_menu_cache
+from .models import AskGTDocument
+
+logger = logging.getLogger(__name__)
+
+# C tabanlı yajl2_c backend'i varsa kullan, yoksa ijson'un varsayılanına düş
+try:
+    ijson_backend = ijson.get_backend('yajl2_c')
+except ImportError:
+    ijson_backend = ijson
+
+BATCH_SIZE = 500
+ETAG_CACHE_KEY = 'askgt_sync_etag'
+REQUIRED_FIELDS = ('id', 'title', 'url', 'category')
+UPDATE_FIELDS = ['baslik', 'orijinal_url', 'kategori', 'ozet', 'content_hash', 'guncelleme_tarihi']
+
+# API 304 Not Modified döndüğünde fetch_documents tarafından döner
+NOT_MODIFIED = object()
+
+# Celery worker içinde tekrarlanan çalıştırmalar keep-alive bağlantıyı paylaşır
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+
+def default_api_url():
+    return getattr(settings, 'ASKGT_API_URL', 'https://api.example.com/documents')
+
+
+def fetch_documents(api_url, timeout, use_etag=True):
+    """
+    API'den dokümanları akış halinde çek
+
+    NOT_MODIFIED, hata durumunda None ya da (doküman iteratörü, ETag) döner.
+    """
+    try:
+        headers = {
+            'User-Agent': 'Portall-AskGT-Sync/1.0',
+            'Accept': 'application/json',
+        }
+
+        # API key varsa ekle
+        api_key = getattr(settings, 'ASKGT_API_KEY', None)
+        if api_key:
+            headers['Authorization'] = f'Bearer {api_key}'
+
+        # Son başarılı senkronizasyonun ETag'i ile koşullu istek gönder
+        last_etag = cache.get(ETAG_CACHE_KEY) if use_etag else None
+        if last_etag:
+            headers['If-None-Match'] = last_etag
+
+        response = _SESSION.get(api_url, headers=headers, timeout=timeout, stream=True)
+
+        if response.status_code == 304:
+            response.close()
+            logger.info("AskGT sync: API içeriği değişmemiş (304)")
+            return NOT_MODIFIED
+
+        response.raise_for_status()
+
+        return iter_documents(response), response.headers.get('ETag')
+
+    except requests.exceptions.RequestException as e:
+        logger.error(f"API request failed: {e}")
+        return None
+
+
+def iter_documents(response):
+    """Yanıt gövdesindeki dokümanları indirme sürerken tek tek ayrıştır"""
+    # gzip/deflate sıkıştırmasını ham akış üzerinde çöz
+    response.raw.decode_content = True
+
+    try:
+        yield from ijson_backend.items(response.raw, 'documents.item', use_float=True)
+    finally:
+        response.close()
+
+
+def store_etag(etag):
+    """ETag yalnızca tüm partiler eksiksiz yazıldıktan sonra saklanır"""
+    if etag:
+        cache.set(ETAG_CACHE_KEY, etag, None)
+
+
+def upsert_documents(documents, dry_run=False, verbose=False):
+    """
+    Dokümanları karşılaştır ve tek bir INSERT ... ON CONFLICT ile yaz
+
+    (yeni sayısı, güncellenen sayısı, mesajlar) döner; mesajlar (stil, metin) çiftleridir.
+    """
+    # Satır bazlı mesajlar biriktirilip çağırana tek seferde verilir
+    messages = []
+
+    # Geçerli dokümanları kaynak_id'ye göre topla
+    incoming = {}
+    for doc_data in documents:
+        if not all(field in doc_data for field in REQUIRED_FIELDS):
+            messages.append(('WARNING', f"⚠️ Eksik alan: {doc_data.get('id', 'unknown')}"))
+            continue
+        incoming[str(doc_data['id'])] = doc_data
+
+    # Mevcut dokümanları tek sorguda çek
+    existing = AskGTDocument.objects.filter(
+        kaynak_id__in=list(incoming)
+    ).in_bulk(field_name='kaynak_id')
+
+    to_create = []
+    to_update = []
+    now = timezone.now()
+
+    for kaynak_id, doc_data in incoming.items():
+        try:
+            # Alanları bir kez kırp, aşağıda tekrar tekrar kullan
+            title = doc_data['title'][:255]
+            url = doc_data['url']
+            category = doc_data['category'][:100]
+            summary = doc_data.get('summary', '')[:1000]
+
+            document = existing.get(kaynak_id)
+            content_hash = AskGTDocument.build_content_hash(title, url, category, summary)
+
+            if document is None:
+                document = AskGTDocument(
+                    kaynak_id=kaynak_id,
+                    baslik=title,
+                    orijinal_url=url,
+                    kategori=category,
+                    ozet=summary,
+                    content_hash=content_hash,
+                    is_active=doc_data.get('active', True),
+                )
+                to_create.append(document)
+                if verbose and not dry_run:
+                    messages.append((None, f"➕ Yeni: {document.baslik}"))
+                continue
+
+            # İçerik özeti aynıysa alanları tek tek karşılaştırmaya gerek yok
+            updated = document.content_hash != content_hash
+            if updated:
+                document.baslik = title
+                document.orijinal_url = url
+                document.kategori = category
+                document.ozet = summary
+                document.content_hash = content_hash
+
+            if updated or dry_run:
+                document.guncelleme_tarihi = now
+                to_update.append(document)
+                if verbose and not dry_run:
+                    messages.append((None, f"🔄 Güncellendi: {document.baslik}"))
+
+        except Exception as e:
+            logger.error(f"Document processing error: {e}")
+            messages.append(('ERROR', f"❌ İşleme hatası: {kaynak_id} - {e}"))
+
+    if not dry_run:
+        # Yeni ve değişen satırlar tek bir INSERT ... ON CONFLICT (kaynak_id) DO UPDATE ile yazılır
+        with transaction.atomic():
+            AskGTDocument.objects.bulk_create(
+                to_create + to_update,
+                batch_size=BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['kaynak_id'],
+                update_fields=UPDATE_FIELDS,
+            )
+
+        # Toplu işlemler sinyal tetiklemediği için menü cache'ini elle temizle
+        if to_create or to_update:
+            invalidate_askgt_menu_cache()
+
+        messages.append((None, f"➕ {len(to_create)} yeni, 🔄 {len(to_update)} güncellendi"))
+
+    return len(to_create), len(to_update), messages
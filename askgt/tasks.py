@@ -1,31 +1,67 @@
-from celery import shared_task
-from django.core.management import call_command
+from celery import chord, shared_task
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.conf import settings
 from django.utils import timezone
-from django.db.models import Count
+from django.db import transaction
+from django.db.models import Count, Sum
 from datetime import timedelta
+from itertools import islice
 import logging
 
-from .models import AskGTDocument
+from .models import AskGTDocument, Answer, Question, KnowledgeArticle, UserActivityStat
+from .counters import deferred_question_counts, refresh_question_counts
 
 logger = logging.getLogger(__name__)
 
+WEEKLY_REPORT_DOCUMENT_FIELDS = ('id', 'baslik', 'kategori', 'eklenme_tarihi', 'view_count', 'orijinal_url')
+
+BULK_ACTION_CHUNK_SIZE = 500
+BULK_ITEM_TYPES = {
+    'question': (Question, 'soru'),
+    'answer': (Answer, 'cevap'),
+}
+BULK_ACTIONS = {
+    'approve': 'onaylandı',
+    'reject': 'reddedildi',
+    'delete': 'silindi',
+}
+
 
 @shared_task(bind=True, max_retries=3)
 def sync_documents_from_api(self):
     """
     Harici API'den AskGT dokümanlarını senkronize et
     """
+    from .sync import BATCH_SIZE, NOT_MODIFIED, default_api_url, fetch_documents
+    
     try:
         logger.info("AskGT doküman senkronizasyonu başlatılıyor...")
         
-        # Management command'ı çalıştır
-        call_command('sync_askgt_documents')
+        result = fetch_documents(default_api_url(), timeout=30)
+        if result is NOT_MODIFIED:
+            logger.info("AskGT doküman senkronizasyonu atlandı: değişiklik yok")
+            return "AskGT documents not modified"
+        if not result:
+            raise RuntimeError("API'den veri alınamadı")
+        
+        documents, etag = result
+        
+        # Bu worker yalnızca akışı okur; yazma işleri partiler halinde diğer worker'lara dağıtılır
+        batches = []
+        while True:
+            batch = list(islice(documents, BATCH_SIZE))
+            if not batch:
+                break
+            batches.append(upsert_askgt_batch.s(batch))
         
-        logger.info("AskGT doküman senkronizasyonu tamamlandı")
-        return "AskGT documents synced successfully"
+        if not batches:
+            return finalize_askgt_sync([], etag)
+        
+        chord(batches)(finalize_askgt_sync.s(etag))
+        
+        logger.info(f"AskGT doküman senkronizasyonu {len(batches)} partiye bölündü")
+        return f"AskGT sync dispatched in {len(batches)} batches"
         
     except Exception as exc:
         logger.error(f"AskGT sync error: {exc}")
@@ -39,6 +75,34 @@ def sync_documents_from_api(self):
             return f"AskGT sync failed after {self.max_retries} retries: {exc}"
 
 
+@shared_task
+def upsert_askgt_batch(documents):
+    """
+    Bir parti AskGT dokümanını tek INSERT ... ON CONFLICT ile yaz
+    """
+    from .sync import upsert_documents
+    
+    created, updated, _ = upsert_documents(documents)
+    return [created, updated]
+
+
+@shared_task
+def finalize_askgt_sync(results, etag=None):
+    """
+    Tüm partiler yazıldıktan sonra ETag'i sakla ve özeti logla
+    """
+    from .sync import store_etag
+    
+    # Bir parti hata verirse chord bu adımı çalıştırmaz; ETag saklanmaz
+    store_etag(etag)
+    
+    created = sum(result[0] for result in results)
+    updated = sum(result[1] for result in results)
+    
+    logger.info(f"AskGT doküman senkronizasyonu tamamlandı: {created} yeni, {updated} güncellendi")
+    return f"AskGT documents synced: {created} created, {updated} updated"
+
+
 @shared_task
 def send_weekly_stats_report():
     """
@@ -49,19 +113,25 @@ def send_weekly_stats_report():
         week_ago = timezone.now() - timedelta(days=7)
         
         # Bu hafta eklenen dokümanlar
-        new_documents = AskGTDocument.objects.filter(
-            is_active=True,
-            eklenme_tarihi__gte=week_ago
-        ).order_by('-eklenme_tarihi')
+        # Şablonda da dolaşıldığı için bir kez değerlendirilir; e-posta şablonları
+        # yalnızca bu alanları okuduğundan model nesnesi oluşturulmaz
+        new_documents = list(
+            AskGTDocument.objects.filter(
+                is_active=True,
+                eklenme_tarihi__gte=week_ago
+            ).order_by('-eklenme_tarihi').values(*WEEKLY_REPORT_DOCUMENT_FIELDS)
+        )
         
         # Bu hafta en çok görüntülenen dokümanlar
-        popular_this_week = AskGTDocument.objects.filter(
-            is_active=True,
-            view_count__gt=0
-        ).order_by('-view_count')[:10]
+        popular_this_week = list(
+            AskGTDocument.objects.filter(
+                is_active=True,
+                view_count__gt=0
+            ).order_by('-view_count').values(*WEEKLY_REPORT_DOCUMENT_FIELDS)[:10]
+        )
         
         # Kategori dağılımı
-        category_stats = (
+        category_stats = list(
             AskGTDocument.objects
             .filter(is_active=True)
             .values('kategori')
@@ -69,17 +139,21 @@ def send_weekly_stats_report():
             .order_by('-count')
         )
         
-        # Genel istatistikler
-        total_documents = AskGTDocument.objects.filter(is_active=True).count()
-        total_categories = category_stats.count()
-        total_views = sum(doc.view_count for doc in AskGTDocument.objects.filter(is_active=True))
+        # Genel istatistikler tek sorguda veritabanında hesaplanır
+        totals = AskGTDocument.objects.filter(is_active=True).aggregate(
+            total_documents=Count('id'),
+            total_views=Sum('view_count'),
+        )
+        total_documents = totals['total_documents']
+        total_categories = len(category_stats)
+        total_views = totals['total_views'] or 0
         
         # E-posta içeriği hazırla
         context = {
             'week_start': week_ago.strftime('%d.%m.%Y'),
             'week_end': timezone.now().strftime('%d.%m.%Y'),
             'new_documents': new_documents,
-            'new_documents_count': new_documents.count(),
+            'new_documents_count': len(new_documents),
             'popular_documents': popular_this_week,
             'category_stats': category_stats,
             'total_documents': total_documents,
@@ -123,18 +197,18 @@ def cleanup_old_documents():
         # 6 ay önce
         six_months_ago = timezone.now() - timedelta(days=180)
         
-        # Hiç görüntülenmemiş ve 6 aydan eski dokümanlar
-        old_documents = AskGTDocument.objects.filter(
+        # Hiç görüntülenmemiş ve 6 aydan eski dokümanları pasif yap (silme);
+        # update() etkilenen satır sayısını döndürdüğü için ayrıca count() gerekmez
+        count = AskGTDocument.objects.filter(
             view_count=0,
             eklenme_tarihi__lt=six_months_ago,
             is_active=True
-        )
-        
-        count = old_documents.count()
+        ).update(is_active=False)
         
         if count > 0:
-            # Pasif yap (silme)
-            old_documents.update(is_active=False)
+            # Toplu update sinyal tetiklemediği için menü cache'ini elle temizle
+            from .context_processors import invalidate_askgt_menu_cache
+            invalidate_askgt_menu_cache()
             logger.info(f"AskGT: {count} eski doküman pasif yapıldı")
             return f"Deactivated {count} old documents"
         else:
@@ -152,29 +226,14 @@ def update_document_stats():
     Doküman istatistiklerini güncelle ve cache'i temizle
     """
     try:
-        from django.core.cache import cache
+        from .context_processors import refresh_askgt_menu_cache
+        from .versioned_cache import bump_cache_version
         
-        # Cache anahtarlarını temizle
-        cache.delete('askgt_categories_menu')
-        cache.delete('askgt_stats')
+        # Yeni istatistikleri tek sorguda hesapla ve cache'e koy
+        refresh_askgt_menu_cache()
         
-        # Yeni istatistikleri hesapla ve cache'e koy
-        categories = (
-            AskGTDocument.objects
-            .filter(is_active=True)
-            .values('kategori')
-            .annotate(count=Count('id'))
-            .order_by('kategori')
-        )
-        
-        cache.set('askgt_categories_menu', list(categories), 60 * 15)
-        
-        stats = {
-            'total_documents': AskGTDocument.objects.filter(is_active=True).count(),
-            'total_categories': len(categories),
-        }
-        
-        cache.set('askgt_stats', stats, 60 * 30)
+        # Ana sayfa blokları bir sonraki istekte yeniden oluşturulur
+        bump_cache_version()
         
         logger.info("AskGT istatistikleri güncellendi ve cache temizlendi")
         return "Document stats updated and cache cleared"
@@ -182,3 +241,111 @@ def update_document_stats():
     except Exception as e:
         logger.error(f"AskGT stats update error: {e}")
         return f"Stats update failed: {e}"
+
+
+@shared_task
+def apply_bulk_action(action, item_type, item_ids, user_id):
+    """
+    Yönetim panelindeki toplu işlemleri parçalar halinde uygula
+    """
+    model, label = BULK_ITEM_TYPES[item_type]
+    
+    if item_type == 'question':
+        updates = {
+            'approve': {'status': 'approved'},
+            'reject': {'status': 'rejected'},
+        }
+    else:
+        # Answer'da onay alanları yok; onay yayın durumuna eşlenir
+        updates = {
+            'approve': {'status': 'published'},
+            'reject': {'status': 'draft'},
+        }
+    
+    count = 0
+    # Silme, soru başına sayaç yenileyen sinyaller tetikler; sayaçlar sonda bir kez yenilenir
+    with deferred_question_counts():
+        for start in range(0, len(item_ids), BULK_ACTION_CHUNK_SIZE):
+            items = model.objects.filter(id__in=item_ids[start:start + BULK_ACTION_CHUNK_SIZE])
+            
+            if action == 'delete':
+                _, deleted = items.delete()
+                count += deleted.get(model._meta.label, 0)
+            else:
+                count += items.update(**updates[action])
+    
+    if item_type == 'question':
+        # Toplu update sinyal tetiklemez, silme sinyalleri bastırıldı; denormalize sayaçlar elle yenilenir
+        refresh_question_counts()
+    
+    from .management_views import invalidate_dashboard_cache
+    invalidate_dashboard_cache()
+    
+    message = f'{count} {label} {BULK_ACTIONS[action]}'
+    logger.info(f"AskGT toplu işlem: {message}")
+    return {'count': count, 'message': message}
+
+
+@shared_task
+def refresh_user_activity_stats():
+    """
+    Kullanıcı katkı sayılarının snapshot tablosunu yenile
+    """
+    try:
+        activity = {}
+        sources = (
+            ('question_count', Question),
+            ('answer_count', Answer),
+            ('article_count', KnowledgeArticle),
+        )
+        
+        # Her model için kullanıcı başına tek GROUP BY sorgusu
+        for field, model in sources:
+            rows = (
+                model.objects
+                .filter(created_by__isnull=False)
+                .values('created_by')
+                .annotate(count=Count('id'))
+                .order_by()
+            )
+            for row in rows:
+                activity.setdefault(row['created_by'], {})[field] = row['count']
+        
+        stats = [
+            UserActivityStat(user_id=user_id, **counts)
+            for user_id, counts in activity.items()
+        ]
+        
+        with transaction.atomic():
+            UserActivityStat.objects.bulk_create(
+                stats,
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=['user'],
+                update_fields=['question_count', 'answer_count', 'article_count', 'updated_at'],
+            )
+            # Artık katkısı olmayan kullanıcıları kaldır
+            UserActivityStat.objects.exclude(user_id__in=list(activity)).delete()
+        
+        logger.info(f"AskGT kullanıcı aktivite istatistikleri güncellendi: {len(stats)} kullanıcı")
+        return f"User activity stats refreshed for {len(stats)} users"
+        
+    except Exception as e:
+        logger.error(f"AskGT user activity refresh error: {e}")
+        return f"User activity refresh failed: {e}"
+
+
+@shared_task
+def flush_view_counters():
+    """
+    Redis'te biriken görüntülenme sayılarını veritabanına yaz
+    """
+    try:
+        from .counters import flush_buffered_views
+        
+        flushed = flush_buffered_views()
+        return f"Flushed view counters for {flushed} objects"
+        
+    except Exception as e:
+        logger.error(f"AskGT view counter flush error: {e}")
+        return f"View counter flush failed: {e}"
@@ -46,4 +46,5 @@ urlpatterns = [
     path('yonetim/teknolojiler/', management_views.technology_management, name='management_technology_list'),
     path('yonetim/kullanici-istatistikleri/', management_views.user_statistics, name='management_user_statistics'),
     path('yonetim/toplu-islem/', management_views.bulk_action, name='management_bulk_action'),
+    path('yonetim/toplu-islem/durum/<str:task_id>/', management_views.bulk_action_status, name='management_bulk_action_status'),
 ]
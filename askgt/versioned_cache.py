@@ -0,0 +1,45 @@
+from core import versioned_cache
+
+
+CACHE_NAMESPACE = 'askgt'
+
+# Filtre menüsü yalnızca kategori/teknoloji değişince yenilenir; oylar bu sürümü artırmaz
+FILTER_OPTIONS_NAMESPACE = 'askgt:filters'
+
+# Sürüm artırılarak geçersiz kılınır; TTL yalnızca eski anahtarları temizler
+HOME_BLOCK_TIMEOUT = 600
+
+
+def current_version():
+    """
+    Paylaşılan AskGT cache sürümü (tüm worker'lar için ortak)
+    """
+    return versioned_cache.current_version(CACHE_NAMESPACE)
+
+
+def versioned_key(name):
+    """
+    Geçerli AskGT cache sürümüne bağlı anahtar üret
+    """
+    return versioned_cache.versioned_key(CACHE_NAMESPACE, name)
+
+
+def bump_cache_version():
+    """
+    Tüm sürümlü AskGT anahtarlarını tek seferde geçersiz kıl
+    """
+    versioned_cache.bump_version(CACHE_NAMESPACE)
+
+
+def filter_options_version():
+    """
+    Kategori/teknoloji filtre seçeneklerinin paylaşılan sürümü
+    """
+    return versioned_cache.current_version(FILTER_OPTIONS_NAMESPACE)
+
+
+def bump_filter_options_version():
+    """
+    Worker'lardaki filtre menüsü kopyalarını geçersiz kıl
+    """
+    versioned_cache.bump_version(FILTER_OPTIONS_NAMESPACE)
@@ -1,41 +1,143 @@
+from functools import lru_cache
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
-from django.db.models import Q, Count, F
+from django.db import connection, transaction
+from django.db.models import Q, Count, Exists, F, OuterRef, Prefetch
 from django.contrib import messages
+from django.core.cache import cache
 from django.http import JsonResponse
+from django.utils import timezone
 from django.views.decorators.http import require_POST
+from .context_processors import DOCUMENT_LISTS_CACHE_KEY, get_askgt_menu_data
+from .counters import buffer_view, record_question_view
+from .search import apply_text_search
+from .versioned_cache import HOME_BLOCK_TIMEOUT, bump_cache_version, filter_options_version, versioned_key
 from .models import (
     Question, Answer, KnowledgeCategory, Technology, FAQ, 
-    KnowledgeArticle, QuestionView, QuestionVote, AnswerVote, AskGTDocument
+    KnowledgeArticle, QuestionVote, AnswerVote, AskGTDocument
 )
 
+# Liste sayfalarındaki teknoloji rozetleri için yalnızca gereken kolonlar
+TECHNOLOGY_LIST_PREFETCH = Prefetch('technologies', queryset=Technology.objects.only('id', 'name', 'color', 'icon'))
+
+# Popüler liste görüntülenme sayaçlarıyla değişir; bu süre kadar gecikmesi kabul edilir
+DOCUMENT_LISTS_CACHE_TIMEOUT = 600
+
+QUESTION_DETAIL_DEFERRED_FIELDS = (
+    'category__description',
+    'created_by__password', 'created_by__last_login',
+    'approved_by__password', 'approved_by__last_login',
+)
+
+
+@lru_cache(maxsize=4)
+def _active_categories(version):
+    return tuple(KnowledgeCategory.objects.filter(is_active=True).defer('description'))
+
+
+@lru_cache(maxsize=4)
+def _active_technologies(version):
+    return tuple(Technology.objects.filter(is_active=True).defer('description'))
+
+
+def active_categories():
+    """Filtre menüsü kategorileri; süreç içinde tutulur, sürüm artınca yenilenir"""
+    return _active_categories(filter_options_version())
+
+
+def active_technologies():
+    """Filtre menüsü teknolojileri; süreç içinde tutulur, sürüm artınca yenilenir"""
+    return _active_technologies(filter_options_version())
+
+
+def upsert_vote(vote_model, target_field, target_id, user_id, is_helpful):
+    """
+    Oyu tek INSERT ... ON CONFLICT ile yaz; (helpful, not_helpful) sayaç farkını döndür
+    """
+    quote = connection.ops.quote_name
+    table = quote(vote_model._meta.db_table)
+    target_column = quote(vote_model._meta.get_field(target_field).column)
+    user_column = quote(vote_model._meta.get_field('user').column)
+    
+    # Önceki değer CTE'den, yeni satır mı olduğu xmax'tan okunur
+    sql = f"""
+        WITH previous AS (
+            SELECT is_helpful FROM {table} WHERE {target_column} = %s AND {user_column} = %s
+        )
+        INSERT INTO {table} ({target_column}, {user_column}, is_helpful, created_at)
+        VALUES (%s, %s, %s, %s)
+        ON CONFLICT ({target_column}, {user_column}) DO UPDATE SET is_helpful = EXCLUDED.is_helpful
+        RETURNING (xmax = 0), (SELECT is_helpful FROM previous)
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [target_id, user_id, target_id, user_id, is_helpful, timezone.now()])
+        inserted, previous = cursor.fetchone()
+    
+    if inserted:
+        return (1, 0) if is_helpful else (0, 1)
+    if previous is None or previous == is_helpful:
+        # previous yoksa satır eşzamanlı bir istekte eklendi; sayacı o istek günceller
+        return 0, 0
+    return (1, -1) if is_helpful else (-1, 1)
+
+
+def filter_by_technology(queryset, technology_id):
+    """M2M JOIN (ve DISTINCT ihtiyacı) yerine ara tabloda EXISTS alt sorgusu ile filtrele"""
+    model = queryset.model
+    through = model.technologies.through
+    return queryset.filter(Exists(through.objects.filter(**{
+        f'{model._meta.model_name}_id': OuterRef('pk'),
+        'technology_id': technology_id,
+    })))
+
 
 @login_required
 def askgt_home(request):
     """AskGT home page with featured content"""
+    # Bloklar list() ile sonuçlandırılır ki cache'teki nesne kendi kendine yetsin
     # Featured FAQs
-    featured_faqs = FAQ.objects.filter(is_featured=True, is_active=True)[:6]
+    featured_faqs = cache.get_or_set(
+        versioned_key('featured_faqs'),
+        lambda: list(FAQ.objects.filter(is_featured=True, is_active=True)[:6]),
+        HOME_BLOCK_TIMEOUT
+    )
     
     # Recent questions
-    recent_questions = Question.objects.filter(
-        status='approved', is_active=True
-    ).select_related('category', 'created_by').prefetch_related('technologies')[:8]
+    recent_questions = cache.get_or_set(
+        versioned_key('recent_questions'),
+        lambda: list(Question.objects.filter(
+            status='approved', is_active=True
+        ).select_related('category', 'created_by').prefetch_related('technologies')[:8]),
+        HOME_BLOCK_TIMEOUT
+    )
     
     # Popular questions (by view count)
-    popular_questions = Question.objects.filter(
-        status='approved', is_active=True
-    ).order_by('-view_count')[:5]
+    popular_questions = cache.get_or_set(
+        versioned_key('popular_questions'),
+        lambda: list(Question.objects.filter(
+            status='approved', is_active=True
+        ).order_by('-view_count')[:5]),
+        HOME_BLOCK_TIMEOUT
+    )
     
-    # Categories with question counts
-    categories = KnowledgeCategory.objects.annotate(
-        question_count=Count('questions', filter=Q(questions__status='approved', questions__is_active=True))
-    ).filter(is_active=True, parent=None)[:8]
+    # Categories with question counts (denormalize sayaç; JOIN/GROUP BY yok)
+    categories = cache.get_or_set(
+        versioned_key('categories'),
+        lambda: list(KnowledgeCategory.objects.filter(is_active=True, parent=None).annotate(
+            question_count=F('approved_question_count')
+        ).order_by('-approved_question_count')[:8]),
+        HOME_BLOCK_TIMEOUT
+    )
     
     # Technologies with question counts
-    technologies = Technology.objects.annotate(
-        question_count=Count('question', filter=Q(question__status='approved', question__is_active=True))
-    ).filter(is_active=True)[:10]
+    technologies = cache.get_or_set(
+        versioned_key('technologies'),
+        lambda: list(Technology.objects.filter(is_active=True).annotate(
+            question_count=F('approved_question_count')
+        ).order_by('-approved_question_count')[:10]),
+        HOME_BLOCK_TIMEOUT
+    )
     
     context = {
         'page_title': 'Bilgi Bankası',
@@ -52,18 +154,30 @@ def askgt_home(request):
 @login_required
 def question_list(request):
     """Question list with filtering and search"""
+    # Listede yalnızca yayınlanmış cevaplar gösterilir; gereksiz kolonlar çekilmez
+    published_answers = Prefetch(
+        'answers',
+        queryset=Answer.objects.filter(status='published', is_active=True).only(
+            'id', 'question_id', 'is_accepted'
+        ),
+        to_attr='published_answers'
+    )
+    # Liste şablonu gövdeyi göstermez; büyük TEXT kolonu detay sayfasına kalır
     questions = Question.objects.filter(status='approved', is_active=True).select_related(
         'category', 'created_by'
-    ).prefetch_related('technologies', 'answers')
+    ).prefetch_related(TECHNOLOGY_LIST_PREFETCH, published_answers).defer('content')
     
     # Search functionality
     search_query = request.GET.get('search', '')
     if search_query:
-        questions = questions.filter(
-            Q(title__icontains=search_query) |
-            Q(content__icontains=search_query) |
-            Q(answers__content__icontains=search_query)
-        ).distinct()
+        # JOIN + DISTINCT yerine EXISTS alt sorgusu; her iki taraf da GIN indeksli
+        matching_answers = apply_text_search(
+            Answer.objects.filter(question_id=OuterRef('pk'), status='published', is_active=True),
+            search_query, ['content']
+        )
+        questions = apply_text_search(
+            questions, search_query, ['title', 'content'], extra=Exists(matching_answers)
+        )
     
     # Filter by category
     category_filter = request.GET.get('category', '')
@@ -73,7 +187,7 @@ def question_list(request):
     # Filter by technology
     technology_filter = request.GET.get('technology', '')
     if technology_filter:
-        questions = questions.filter(technologies__id=technology_filter)
+        questions = filter_by_technology(questions, technology_filter)
     
     # Filter by difficulty
     difficulty_filter = request.GET.get('difficulty', '')
@@ -95,8 +209,8 @@ def question_list(request):
     page_obj = paginator.get_page(page_number)
     
     # Get filter options
-    categories = KnowledgeCategory.objects.filter(is_active=True)
-    technologies = Technology.objects.filter(is_active=True)
+    categories = active_categories()
+    technologies = active_technologies()
     difficulty_choices = Question._meta.get_field('difficulty').choices
     
     context = {
@@ -120,41 +234,43 @@ def question_list(request):
 @login_required
 def question_detail(request, question_id):
     """Question detail view with answers"""
+    # İlişkili satırların sayfada kullanılmayan geniş kolonları JOIN'den çekilmez
     question = get_object_or_404(
         Question.objects.select_related('category', 'created_by', 'approved_by')
-                       .prefetch_related('technologies', 'tags'),
+                       .defer(*QUESTION_DETAIL_DEFERRED_FIELDS)
+                       .prefetch_related(
+                           TECHNOLOGY_LIST_PREFETCH, 'tags',
+                           Prefetch(
+                               'answers',
+                               queryset=Answer.objects.filter(status='published', is_active=True)
+                                   .select_related('created_by')
+                                   .order_by('-is_accepted', '-is_official', '-helpful_count'),
+                               to_attr='published_answers'
+                           )
+                       ),
         id=question_id, status='approved', is_active=True
     )
     
-    # Track view
-    view, created = QuestionView.objects.get_or_create(
-        question=question,
-        user=request.user,
-        defaults={'ip_address': request.META.get('REMOTE_ADDR')}
-    )
-    
-    if created:
-        # Increment view count
-        Question.objects.filter(id=question_id).update(view_count=F('view_count') + 1)
+    # Track view (Redis üzerinden; her istekte veritabanına yazılmaz)
+    record_question_view(question.id, request.user.id, request.META.get('REMOTE_ADDR'))
     
-    # Get answers
-    answers = question.answers.filter(
-        status='published', is_active=True
-    ).select_related('created_by').order_by('-is_accepted', '-is_official', '-helpful_count')
+    # Get answers (prefetch ile zaten liste; ek sorgu yok)
+    answers = question.published_answers
     
-    # Check if user has voted
+    # Check if user has voted (şablon yalnızca is_helpful alanını okur)
     user_question_vote = None
     if request.user.is_authenticated:
-        try:
-            user_question_vote = QuestionVote.objects.get(question=question, user=request.user)
-        except QuestionVote.DoesNotExist:
-            pass
+        user_question_vote = QuestionVote.objects.filter(
+            question=question, user=request.user
+        ).values('is_helpful').first()
     
     # Get user votes for answers
     user_answer_votes = {}
-    if request.user.is_authenticated:
-        votes = AnswerVote.objects.filter(answer__in=answers, user=request.user)
-        user_answer_votes = {vote.answer_id: vote.is_helpful for vote in votes}
+    if request.user.is_authenticated and answers:
+        user_answer_votes = dict(
+            AnswerVote.objects.filter(answer_id__in=[answer.id for answer in answers], user=request.user)
+            .values_list('answer_id', 'is_helpful')
+        )
     
     # Related questions
     related_questions = Question.objects.filter(
@@ -177,34 +293,28 @@ def question_detail(request, question_id):
 @require_POST
 def vote_question(request, question_id):
     """Vote for a question (helpful/not helpful)"""
-    question = get_object_or_404(Question, id=question_id, status='approved', is_active=True)
+    get_object_or_404(Question.objects.only('id'), id=question_id, status='approved', is_active=True)
     is_helpful = request.POST.get('is_helpful') == 'true'
     
-    vote, created = QuestionVote.objects.get_or_create(
-        question=question,
-        user=request.user,
-        defaults={'is_helpful': is_helpful}
-    )
+    with transaction.atomic():
+        # Oyların yeniden sayılması yerine geçişten türetilen fark uygulanır
+        delta_helpful, delta_not_helpful = upsert_vote(QuestionVote, 'question', question_id, request.user.id, is_helpful)
+        
+        if delta_helpful or delta_not_helpful:
+            Question.objects.filter(id=question_id).update(
+                helpful_count=F('helpful_count') + delta_helpful,
+                not_helpful_count=F('not_helpful_count') + delta_not_helpful
+            )
     
-    if not created:
-        # Update existing vote
-        if vote.is_helpful != is_helpful:
-            vote.is_helpful = is_helpful
-            vote.save()
+    if delta_helpful or delta_not_helpful:
+        bump_cache_version()
     
-    # Update question vote counts
-    helpful_count = question.votes.filter(is_helpful=True).count()
-    not_helpful_count = question.votes.filter(is_helpful=False).count()
-    
-    Question.objects.filter(id=question_id).update(
-        helpful_count=helpful_count,
-        not_helpful_count=not_helpful_count
-    )
+    counts = Question.objects.filter(id=question_id).values('helpful_count', 'not_helpful_count').first()
     
     return JsonResponse({
         'success': True,
-        'helpful_count': helpful_count,
-        'not_helpful_count': not_helpful_count,
+        'helpful_count': counts['helpful_count'],
+        'not_helpful_count': counts['not_helpful_count'],
         'user_vote': is_helpful
     })
 
@@ -213,34 +323,28 @@ def vote_question(request, question_id):
 @require_POST
 def vote_answer(request, answer_id):
     """Vote for an answer (helpful/not helpful)"""
-    answer = get_object_or_404(Answer, id=answer_id, status='published', is_active=True)
+    get_object_or_404(Answer.objects.only('id'), id=answer_id, status='published', is_active=True)
     is_helpful = request.POST.get('is_helpful') == 'true'
     
-    vote, created = AnswerVote.objects.get_or_create(
-        answer=answer,
-        user=request.user,
-        defaults={'is_helpful': is_helpful}
-    )
-    
-    if not created:
-        # Update existing vote
-        if vote.is_helpful != is_helpful:
-            vote.is_helpful = is_helpful
-            vote.save()
+    with transaction.atomic():
+        # Oyların yeniden sayılması yerine geçişten türetilen fark uygulanır
+        delta_helpful, delta_not_helpful = upsert_vote(AnswerVote, 'answer', answer_id, request.user.id, is_helpful)
+        
+        if delta_helpful or delta_not_helpful:
+            Answer.objects.filter(id=answer_id).update(
+                helpful_count=F('helpful_count') + delta_helpful,
+                not_helpful_count=F('not_helpful_count') + delta_not_helpful
+            )
     
-    # Update answer vote counts
-    helpful_count = answer.votes.filter(is_helpful=True).count()
-    not_helpful_count = answer.votes.filter(is_helpful=False).count()
+    if delta_helpful or delta_not_helpful:
+        bump_cache_version()
     
-    Answer.objects.filter(id=answer_id).update(
-        helpful_count=helpful_count,
-        not_helpful_count=not_helpful_count
-    )
+    counts = Answer.objects.filter(id=answer_id).values('helpful_count', 'not_helpful_count').first()
     
     return JsonResponse({
         'success': True,
-        'helpful_count': helpful_count,
-        'not_helpful_count': not_helpful_count,
+        'helpful_count': counts['helpful_count'],
+        'not_helpful_count': counts['not_helpful_count'],
         'user_vote': is_helpful
     })
 
@@ -249,7 +353,7 @@ def vote_answer(request, answer_id):
 def category_list(request):
     """Knowledge categories list"""
     categories = KnowledgeCategory.objects.annotate(
-        question_count=Count('questions', filter=Q(questions__status='approved', questions__is_active=True)),
+        question_count=F('approved_question_count'),
         article_count=Count('articles', filter=Q(articles__status='published', articles__is_active=True))
     ).filter(is_active=True, parent=None).order_by('order', 'name')
     
@@ -278,7 +382,7 @@ def category_detail(request, category_id):
     
     # Get subcategories
     subcategories = category.children.filter(is_active=True).annotate(
-        question_count=Count('questions', filter=Q(questions__status='approved', questions__is_active=True))
+        question_count=F('approved_question_count')
     )
     
     context = {
@@ -305,21 +409,18 @@ def faq_list(request):
     # Filter by technology
     technology_filter = request.GET.get('technology', '')
     if technology_filter:
-        faqs = faqs.filter(technologies__id=technology_filter)
+        faqs = filter_by_technology(faqs, technology_filter)
     
     # Search
     search_query = request.GET.get('search', '')
     if search_query:
-        faqs = faqs.filter(
-            Q(question__icontains=search_query) |
-            Q(answer__icontains=search_query)
-        )
+        faqs = apply_text_search(faqs, search_query, ['question', 'answer'])
     
     faqs = faqs.order_by('order', '-created_at')
     
     # Get filter options
-    categories = KnowledgeCategory.objects.filter(is_active=True)
-    technologies = Technology.objects.filter(is_active=True)
+    categories = active_categories()
+    technologies = active_technologies()
     
     context = {
         'page_title': 'Sık Sorulan Sorular',
@@ -341,16 +442,14 @@ def article_list(request):
     """Knowledge articles list"""
     articles = KnowledgeArticle.objects.filter(
         status='published', is_active=True
-    ).select_related('category', 'created_by').prefetch_related('technologies', 'tags')
+    ).select_related('category', 'created_by').prefetch_related(
+        TECHNOLOGY_LIST_PREFETCH, 'tags'
+    ).defer('content')
     
     # Search functionality
     search_query = request.GET.get('search', '')
     if search_query:
-        articles = articles.filter(
-            Q(title__icontains=search_query) |
-            Q(content__icontains=search_query) |
-            Q(summary__icontains=search_query)
-        )
+        articles = apply_text_search(articles, search_query, ['title', 'summary', 'content'])
     
     # Filter by category
     category_filter = request.GET.get('category', '')
@@ -360,7 +459,7 @@ def article_list(request):
     # Filter by technology
     technology_filter = request.GET.get('technology', '')
     if technology_filter:
-        articles = articles.filter(technologies__id=technology_filter)
+        articles = filter_by_technology(articles, technology_filter)
     
     # Filter by difficulty
     difficulty_filter = request.GET.get('difficulty', '')
@@ -382,8 +481,8 @@ def article_list(request):
     page_obj = paginator.get_page(page_number)
     
     # Get filter options
-    categories = KnowledgeCategory.objects.filter(is_active=True)
-    technologies = Technology.objects.filter(is_active=True)
+    categories = active_categories()
+    technologies = active_technologies()
     difficulty_choices = KnowledgeArticle._meta.get_field('difficulty').choices
     
     context = {
@@ -414,7 +513,7 @@ def article_detail(request, slug):
     )
     
     # Increment view count
-    KnowledgeArticle.objects.filter(id=article.id).update(view_count=F('view_count') + 1)
+    buffer_view('article', article.id)
     
     # Related articles
     related_articles = KnowledgeArticle.objects.filter(
@@ -440,12 +539,7 @@ def document_list_by_category(request, kategori):
     documents = AskGTDocument.objects.filter(
         kategori__iexact=kategori,
         is_active=True
-    ).order_by('-eklenme_tarihi')
-    
-    # Sayfalama
-    paginator = Paginator(documents, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    )
     
     # Arama
     search_query = request.GET.get('search', '')
@@ -454,15 +548,18 @@ def document_list_by_category(request, kategori):
             Q(baslik__icontains=search_query) |
             Q(ozet__icontains=search_query)
         )
-        paginator = Paginator(documents, 20)
-        page_obj = paginator.get_page(page_number)
+    
+    # Sayfalama (tek sefer; toplam sayı paginator'dan okunur)
+    paginator = Paginator(documents.order_by('-eklenme_tarihi'), 20)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
     
     context = {
         'page_title': f'{kategori} Dokümanları',
         'kategori': kategori,
         'documents': page_obj,
         'search_query': search_query,
-        'total_count': documents.count(),
+        'total_count': paginator.count,
     }
     
     return render(request, 'askgt/document_list.html', context)
@@ -471,44 +568,46 @@ def document_list_by_category(request, kategori):
 @login_required
 def document_redirect(request, document_id):
     """Redirect to original document URL and increment view count"""
-    document = get_object_or_404(AskGTDocument, id=document_id, is_active=True)
+    # Yönlendirme için yalnızca URL gerekir; model nesnesi oluşturulmaz
+    orijinal_url = get_object_or_404(
+        AskGTDocument.objects.values_list('orijinal_url', flat=True), id=document_id, is_active=True
+    )
     
-    # Görüntülenme sayısını artır
-    document.increment_view_count()
+    # Görüntülenme sayısını Redis'te biriktir (flush_view_counters veritabanına yazar)
+    buffer_view('document', document_id)
     
     # Orijinal URL'ye yönlendir
-    return redirect(document.orijinal_url)
+    return redirect(orijinal_url)
+
+
+def build_dashboard_document_lists():
+    """Doküman dashboard'undaki son eklenen ve popüler doküman listeleri"""
+    active = AskGTDocument.objects.filter(is_active=True)
+    return (
+        list(active.order_by('-eklenme_tarihi')[:10]),
+        list(active.order_by('-view_count')[:5]),
+    )
 
 
 @login_required
 def documents_dashboard(request):
     """AskGT documents dashboard view"""
-    # Son eklenen dokümanlar
-    recent_documents = AskGTDocument.objects.filter(
-        is_active=True
-    ).order_by('-eklenme_tarihi')[:10]
-    
-    # Kategorilere göre istatistikler
-    category_stats = (
-        AskGTDocument.objects
-        .filter(is_active=True)
-        .values('kategori')
-        .annotate(count=Count('id'))
-        .order_by('-count')[:10]
+    # Son eklenen ve en çok görüntülenen dokümanlar; doküman değişince menüyle birlikte temizlenir
+    recent_documents, popular_documents = cache.get_or_set(
+        DOCUMENT_LISTS_CACHE_KEY, build_dashboard_document_lists, DOCUMENT_LISTS_CACHE_TIMEOUT
     )
     
-    # En çok görüntülenen dokümanlar
-    popular_documents = AskGTDocument.objects.filter(
-        is_active=True
-    ).order_by('-view_count')[:5]
+    # Kategorilere göre istatistikler (menü cache'inden; ayrı GROUP BY sorgusu yok)
+    categories, stats = get_askgt_menu_data()
+    category_stats = sorted(categories, key=lambda category: category['count'], reverse=True)[:10]
     
     context = {
         'page_title': 'AskGT Dokümanları',
         'recent_documents': recent_documents,
         'category_stats': category_stats,
         'popular_documents': popular_documents,
-        'total_documents': AskGTDocument.objects.filter(is_active=True).count(),
-        'total_categories': AskGTDocument.objects.filter(is_active=True).values('kategori').distinct().count(),
+        'total_documents': stats['total_documents'],
+        'total_categories': stats['total_categories'],
     }
     
     return render(request, 'askgt/documents_dashboard.html', context)
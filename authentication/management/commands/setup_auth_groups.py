@@ -1,11 +1,13 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import Group, Permission
-from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
 import logging
 
 logger = logging.getLogger(__name__)
 
+PERMISSION_CHUNK_SIZE = 2000
+DEFAULT_BATCH_SIZE = 1000
+
 
 class Command(BaseCommand):
     help = 'Setup authentication groups and permissions for Portall'
@@ -16,10 +18,17 @@ class Command(BaseCommand):
             action='store_true',
             help='Reset existing groups and recreate them',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Rows per INSERT when assigning permissions (lower it for MySQL max_allowed_packet)',
+        )
 
     def handle(self, *args, **options):
         """Setup authentication groups and permissions"""
         
+        self.batch_size = options['batch_size']
         self.stdout.write(
             self.style.SUCCESS('🔐 Setting up Portall authentication groups...')
         )
@@ -131,49 +140,72 @@ class Command(BaseCommand):
                 # Reset groups if requested
                 if options['reset']:
                     self.stdout.write('🔄 Resetting existing groups...')
-                    for group_name in groups_config.keys():
-                        Group.objects.filter(name=group_name).delete()
+                    Group.objects.filter(name__in=list(groups_config)).delete()
+                
+                # Compile patterns once, load every permission they can refer to in
+                # one query and classify each permission in a single pass
+                compiled_patterns = {
+                    group_name: self._compile_patterns(config['permissions'])
+                    for group_name, config in groups_config.items()
+                }
+                permissions = self._load_permissions(
+                    app_label
+                    for compiled in compiled_patterns.values()
+                    for app_label in compiled
+                )
+                group_permissions = self._resolve_permissions(permissions, compiled_patterns)
+                
+                # Create missing groups in one INSERT, then load them all in one query
+                group_names = list(groups_config)
+                existing = set(
+                    Group.objects.filter(name__in=group_names).values_list('name', flat=True)
+                )
+                Group.objects.bulk_create(
+                    [Group(name=group_name) for group_name in group_names if group_name not in existing],
+                    ignore_conflicts=True,
+                )
+                groups_by_name = {
+                    group.name: group for group in Group.objects.filter(name__in=group_names)
+                }
+                
+                # Output is buffered and written once per section
+                lines = []
                 
-                # Create groups
                 created_groups = []
                 for group_name, config in groups_config.items():
-                    group, created = Group.objects.get_or_create(name=group_name)
+                    group = groups_by_name[group_name]
                     
-                    if created:
+                    if group_name not in existing:
                         created_groups.append(group_name)
-                        self.stdout.write(
-                            self.style.SUCCESS(f'✅ Created group: {group_name}')
-                        )
+                        lines.append(self.style.SUCCESS(f'✅ Created group: {group_name}'))
                     else:
-                        self.stdout.write(
-                            self.style.WARNING(f'⚠️  Group already exists: {group_name}')
-                        )
+                        lines.append(self.style.WARNING(f'⚠️  Group already exists: {group_name}'))
                     
-                    # Add permissions (this will be implemented when apps are migrated)
-                    self._add_permissions_to_group(group, config['permissions'])
+                    # Add permissions
+                    assigned = self._add_permissions_to_group(group, group_permissions[group_name])
+                    lines.append(f'   🔑 {assigned} permissions assigned to {group_name}')
+                
+                self.stdout.write('\n'.join(lines))
+                lines.clear()
                 
                 # Summary
-                self.stdout.write('\n' + '='*50)
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f'🎉 Successfully setup {len(groups_config)} authentication groups!'
-                    )
-                )
+                lines.append('\n' + '='*50)
+                lines.append(self.style.SUCCESS(f'🎉 Successfully setup {len(groups_config)} authentication groups!'))
                 
                 if created_groups:
-                    self.stdout.write(
-                        f'📝 New groups created: {", ".join(created_groups)}'
-                    )
+                    lines.append(f'📝 New groups created: {", ".join(created_groups)}')
                 
-                self.stdout.write('\n📋 Group Summary:')
+                lines.append('\n📋 Group Summary:')
                 for group_name, config in groups_config.items():
-                    self.stdout.write(f'  • {group_name}: {config["description"]}')
+                    lines.append(f'  • {group_name}: {config["description"]}')
                 
-                self.stdout.write('\n🔧 Next Steps:')
-                self.stdout.write('  1. Run migrations for all apps')
-                self.stdout.write('  2. Create superuser: python manage.py createsuperuser')
-                self.stdout.write('  3. Assign users to groups via admin panel')
-                self.stdout.write('  4. Test LDAP integration')
+                lines.append('\n🔧 Next Steps:')
+                lines.append('  1. Run migrations for all apps')
+                lines.append('  2. Create superuser: python manage.py createsuperuser')
+                lines.append('  3. Assign users to groups via admin panel')
+                lines.append('  4. Test LDAP integration')
+                
+                self.stdout.write('\n'.join(lines))
                 
         except Exception as e:
             self.stdout.write(
@@ -182,53 +214,75 @@ class Command(BaseCommand):
             logger.error(f'Error setting up authentication groups: {str(e)}')
             raise
 
-    def _add_permissions_to_group(self, group, permission_patterns):
-        """Add permissions to group based on patterns"""
-        # This method will add permissions when the apps are migrated
-        # For now, we'll store the patterns and apply them later
+    def _add_permissions_to_group(self, group, permission_ids):
+        """Add the resolved permissions to group"""
+        # Permissions only exist after migrations; unmatched patterns are simply skipped
+        # Diff against the through table like permissions.set(), but insert in bounded batches
+        through = Group.permissions.through
+        wanted = set(permission_ids)
+        current = set(
+            through.objects.filter(group_id=group.id).values_list('permission_id', flat=True)
+        )
         
-        # Note: Permissions will be applied after migrations
-        # when the actual Permission objects exist in the database
-        pass
-
-    def _get_permissions_by_pattern(self, pattern):
-        """Get permissions matching a pattern like 'app.*' or 'app.view_*'"""
-        permissions = []
+        stale = current - wanted
+        if stale:
+            through.objects.filter(group_id=group.id, permission_id__in=stale).delete()
         
-        if '.' not in pattern:
-            return permissions
-            
-        app_label, perm_pattern = pattern.split('.', 1)
+        through.objects.bulk_create(
+            [through(group_id=group.id, permission_id=permission_id) for permission_id in wanted - current],
+            ignore_conflicts=True,
+            batch_size=self.batch_size,
+        )
+        return len(wanted)
+
+    @staticmethod
+    def _compile_patterns(permission_patterns):
+        """Compile patterns like 'app.*', 'app.view_*' into {app_label: (all, exact, prefixes)}"""
+        compiled = {}
+        for pattern in permission_patterns:
+            if '.' not in pattern:
+                continue
+            app_label, perm_pattern = pattern.split('.', 1)
+            entry = compiled.setdefault(app_label, {'all': False, 'exact': set(), 'prefixes': set()})
+            if perm_pattern == '*':
+                entry['all'] = True
+            elif perm_pattern.endswith('*'):
+                entry['prefixes'].add(perm_pattern[:-1])
+            else:
+                entry['exact'].add(perm_pattern)
         
-        try:
-            # Get all content types for the app
-            content_types = ContentType.objects.filter(app_label=app_label)
-            
-            for ct in content_types:
-                if perm_pattern == '*':
-                    # All permissions for this content type
-                    perms = Permission.objects.filter(content_type=ct)
-                    permissions.extend(perms)
-                elif perm_pattern.endswith('*'):
-                    # Pattern matching like 'view_*'
-                    prefix = perm_pattern[:-1]
-                    perms = Permission.objects.filter(
-                        content_type=ct,
-                        codename__startswith=prefix
-                    )
-                    permissions.extend(perms)
-                else:
-                    # Exact permission match
-                    try:
-                        perm = Permission.objects.get(
-                            content_type=ct,
-                            codename=perm_pattern
-                        )
-                        permissions.append(perm)
-                    except Permission.DoesNotExist:
-                        pass
-                        
-        except ContentType.DoesNotExist:
-            pass
-            
-        return permissions
+        # str.startswith accepts a tuple, so each prefix check is a single call
+        return {
+            app_label: (entry['all'], frozenset(entry['exact']), tuple(entry['prefixes']))
+            for app_label, entry in compiled.items()
+        }
+
+    @staticmethod
+    def _load_permissions(app_labels):
+        """Stream permissions of the given apps from a single query"""
+        return (
+            Permission.objects
+            .filter(content_type__app_label__in=set(app_labels))
+            .select_related('content_type')
+            .only('id', 'codename', 'content_type__app_label')
+            # Classification does not depend on order; skip Permission.Meta.ordering's sort
+            .order_by()
+            .iterator(chunk_size=PERMISSION_CHUNK_SIZE)
+        )
+
+    @staticmethod
+    def _resolve_permissions(permissions, compiled_patterns):
+        """Classify every permission against every group's compiled patterns in one pass"""
+        # Only ids are kept, so streamed Permission instances can be released right away
+        resolved = {group_name: [] for group_name in compiled_patterns}
+        for permission in permissions:
+            app_label = permission.content_type.app_label
+            codename = permission.codename
+            for group_name, compiled in compiled_patterns.items():
+                rule = compiled.get(app_label)
+                if rule is None:
+                    continue
+                match_all, exact, prefixes = rule
+                if match_all or codename in exact or (prefixes and codename.startswith(prefixes)):
+                    resolved[group_name].append(permission.id)
+        return resolved
@@ -11,6 +11,21 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import ldap  # noqa: F401
+    _LDAP_IMPORTABLE = True
+except ImportError:
+    _LDAP_IMPORTABLE = False
+
+# Settings are immutable after startup; resolve them once at import time
+_LDAP_ENABLED = getattr(settings, 'PORTALL_SETTINGS', {}).get('LDAP_ENABLED', False)
+_LDAP_CONFIGURED = hasattr(settings, 'AUTH_LDAP_SERVER_URI')
+_AXES_ENABLED = getattr(settings, 'AXES_ENABLED', False)
+_AXES_COOLOFF = getattr(settings, 'AXES_COOLOFF_TIME', 1)
+_AXES_FAILURE_LIMIT = getattr(settings, 'AXES_FAILURE_LIMIT', 5)
+_SESSION_AGE_MIN = getattr(settings, 'SESSION_COOKIE_AGE', 1800) // 60
+_AUTHENTICATION_BACKENDS = getattr(settings, 'AUTHENTICATION_BACKENDS', [])
+
 
 class CustomLoginView(auth_views.LoginView):
     """
@@ -18,21 +33,24 @@ class CustomLoginView(auth_views.LoginView):
     """
     template_name = 'registration/login.html'
     redirect_authenticated_user = True
+    success_url = reverse_lazy('dashboard:home')
     
     def get_success_url(self):
         """Redirect to dashboard after successful login"""
-        return reverse_lazy('dashboard:home')
+        return self.success_url
     
     def form_valid(self, form):
         """Log successful login attempts"""
-        logger.info(f"Successful login for user: {form.get_user().username}")
-        messages.success(self.request, f'Hoş geldiniz, {form.get_user().get_full_name() or form.get_user().username}!')
+        user = form.get_user()
+        name = user.get_full_name() or user.username
+        logger.info("Successful login for user: %s", user.username)
+        messages.success(self.request, f'Hoş geldiniz, {name}!')
         return super().form_valid(form)
     
     def form_invalid(self, form):
         """Log failed login attempts"""
         username = form.cleaned_data.get('username', 'Unknown')
-        logger.warning(f"Failed login attempt for username: {username} from IP: {self.get_client_ip()}")
+        logger.warning("Failed login attempt for username: %s from IP: %s", username, self.get_client_ip())
         messages.error(self.request, 'Kullanıcı adı veya şifre hatalı.')
         return super().form_invalid(form)
     
@@ -40,10 +58,10 @@ class CustomLoginView(auth_views.LoginView):
         """Get client IP address"""
         x_forwarded_for = self.request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = self.request.META.get('REMOTE_ADDR')
-        return ip
+            # First hop only; partition avoids building the full list of proxies
+            ip, _, _ = x_forwarded_for.partition(',')
+            return ip.strip()
+        return self.request.META.get('REMOTE_ADDR')
 
 
 class CustomLogoutView(auth_views.LogoutView):
@@ -69,8 +87,8 @@ class AccountLockedView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context.update({
-            'cooloff_time': getattr(settings, 'AXES_COOLOFF_TIME', 1),
-            'failure_limit': getattr(settings, 'AXES_FAILURE_LIMIT', 5),
+            'cooloff_time': _AXES_COOLOFF,
+            'failure_limit': _AXES_FAILURE_LIMIT,
         })
         return context
 
@@ -82,7 +100,7 @@ def profile_view(request):
     """
     context = {
         'user': request.user,
-        'ldap_enabled': getattr(settings, 'PORTALL_SETTINGS', {}).get('LDAP_ENABLED', False),
+        'ldap_enabled': _LDAP_ENABLED,
     }
     return render(request, 'registration/profile.html', context)
 
@@ -106,20 +124,16 @@ class HealthCheckView(TemplateView):
         
         # Check LDAP availability
         ldap_status = 'disabled'
-        if hasattr(settings, 'AUTH_LDAP_SERVER_URI'):
-            try:
-                import ldap
-                ldap_status = 'enabled'
-            except ImportError:
-                ldap_status = 'error'
+        if _LDAP_CONFIGURED:
+            ldap_status = 'enabled' if _LDAP_IMPORTABLE else 'error'
         
         # Check Axes status
-        axes_status = 'enabled' if getattr(settings, 'AXES_ENABLED', False) else 'disabled'
+        axes_status = 'enabled' if _AXES_ENABLED else 'disabled'
         
         context.update({
             'ldap_status': ldap_status,
             'axes_status': axes_status,
-            'session_timeout': getattr(settings, 'SESSION_COOKIE_AGE', 1800) // 60,  # minutes
-            'authentication_backends': getattr(settings, 'AUTHENTICATION_BACKENDS', []),
+            'session_timeout': _SESSION_AGE_MIN,  # minutes
+            'authentication_backends': _AUTHENTICATION_BACKENDS,
         })
         return context
@@ -25,3 +25,4 @@ class UserProfileAdmin(admin.ModelAdmin):
     list_filter = ['department', 'theme_preference', 'language', 'is_active']
     search_fields = ['user__username', 'user__first_name', 'user__last_name', 'department']
     raw_id_fields = ['user']
+    list_select_related = ('user',)
@@ -5,11 +5,11 @@ from django.utils import timezone
 
 class BaseModel(models.Model):
     """Base model with common fields for all models"""
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='%(class)s_created')
     updated_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='%(class)s_updated')
-    is_active = models.BooleanField(default=True)
+    is_active = models.BooleanField(default=True, db_index=True)
 
     class Meta:
         abstract = True
@@ -26,6 +26,9 @@ class Category(BaseModel):
     class Meta:
         verbose_name_plural = 'Categories'
         ordering = ['order', 'name']
+        indexes = [
+            models.Index(fields=['is_active', 'order', 'name'], name='core_category_active_order'),
+        ]
 
     def __str__(self):
         return self.name
@@ -38,6 +41,9 @@ class Tag(BaseModel):
 
     class Meta:
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['is_active', 'name'], name='core_tag_active_name'),
+        ]
 
     def __str__(self):
         return self.name
@@ -46,7 +52,7 @@ class Tag(BaseModel):
 class UserProfile(BaseModel):
     """Extended user profile"""
     user = models.OneToOneField(User, on_delete=models.CASCADE)
-    department = models.CharField(max_length=100, blank=True)
+    department = models.CharField(max_length=100, blank=True, db_index=True)
     phone = models.CharField(max_length=20, blank=True)
     avatar = models.ImageField(upload_to='avatars/', blank=True, null=True)
     theme_preference = models.CharField(
@@ -0,0 +1,49 @@
+from django.core.paginator import Paginator
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+class FastCountPaginator(Paginator):
+    """
+    Paginator that counts rows by primary key instead of wrapping the full
+    joined/annotated query in SELECT COUNT(*) FROM (...), and slices pages by
+    primary key so the wide query never runs with a deep OFFSET
+    """
+
+    def __init__(self, object_list, per_page, count_queryset=None, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_queryset = count_queryset
+        self.known_count = count
+
+    @cached_property
+    def count(self):
+        if self.known_count is not None:
+            return self.known_count
+
+        if self.count_queryset is not None:
+            return self.count_queryset.count()
+
+        return self.object_list.model._default_manager.filter(
+            pk__in=self.object_list.values('pk')
+        ).order_by().count()
+
+    def page(self, number):
+        if not isinstance(self.object_list, QuerySet):
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if top + self.orphans >= self.count:
+            top = self.count
+
+        # OFFSET yalnızca dar pk sorgusunda uygulanır
+        pks = list(self.object_list.values_list('pk', flat=True)[bottom:top])
+        positions = {pk: index for index, pk in enumerate(pks)}
+
+        # Satırlar select_related/prefetch_related korunarak pk listesiyle çekilir
+        rows = sorted(
+            self.object_list.filter(pk__in=pks).order_by(),
+            key=lambda obj: positions[obj.pk]
+        )
+        return self._get_page(rows, number, self)
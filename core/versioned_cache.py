@@ -0,0 +1,46 @@
+from django.core.cache import cache
+
+
+def version_key(namespace):
+    """
+    Cache key holding the shared version of a namespace
+    """
+    return f"{namespace}:v"
+
+
+def current_version(namespace):
+    """
+    Shared cache version of a namespace (common to all workers)
+    """
+    return cache.get(version_key(namespace), 1)
+
+
+def current_versions(namespaces):
+    """
+    Versions of several namespaces read in a single round trip
+    """
+    found = cache.get_many([version_key(namespace) for namespace in namespaces])
+    return {namespace: found.get(version_key(namespace), 1) for namespace in namespaces}
+
+
+def versioned_key(namespace, name, version=None):
+    """
+    Key bound to the current version of a namespace
+    """
+    if version is None:
+        version = current_version(namespace)
+    return f"{namespace}:{version}:{name}"
+
+
+def bump_version(namespace):
+    """
+    Invalidate every versioned key of a namespace at once
+    """
+    key = version_key(namespace)
+    # incr only works on an existing key
+    cache.add(key, 1, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # The key was removed between add and incr; recreate it
+        cache.set(key, 2, None)
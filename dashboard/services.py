@@ -1,4 +1,5 @@
-from django.db.models import Count, Q, Avg
+from django.db.models import CharField, Count, F, Max, Q, Avg, Value
+from django.db.models.functions import Left
 from django.utils import timezone
 from datetime import timedelta
 from envanter.models import Server, Application, Database
@@ -14,6 +15,28 @@ try:
 except ImportError:
     CERTIFICATES_AVAILABLE = False
 import json
+from concurrent.futures import ThreadPoolExecutor
+from django.core.cache import cache
+from django.db import connection
+from core.versioned_cache import current_versions, versioned_key
+
+# (bölüm, üretici metod, cache süresi sn); sertifikalar saatlik, envanter dakikalık değişir
+DASHBOARD_SECTIONS = (
+    ('inventory', 'get_system_overview', 60),
+    ('knowledge_base', 'get_knowledge_base_stats', 300),
+    ('duty_schedule', 'get_duty_schedule_info', 300),
+    ('announcements', 'get_announcements_summary', 300),
+    ('system_status', 'get_system_status', 60),
+    ('automation', 'get_automation_stats', 60),
+    ('performance', 'get_performance_alerts', 60),
+    ('quick_links', 'get_quick_links', 600),
+    ('certificates', 'get_certificate_stats', 3600),
+)
+
+
+def section_namespace(name):
+    """Her dashboard bölümü kendi cache sürümüyle ayrı ayrı geçersiz kılınır"""
+    return f'dashboard:{name}'
 
 
 class DashboardDataService:
@@ -24,16 +47,25 @@ class DashboardDataService:
         """Sistem genel bakış"""
         now = timezone.now()
         
-        # Envanter istatistikleri
-        total_servers = Server.objects.count()
-        active_servers = Server.objects.filter(status='active').count()
-        total_applications = Application.objects.count()
+        yesterday = now - timedelta(days=1)
+        
+        # Envanter istatistikleri ve son 24 saatte eklenen kayıtlar (tablo başına tek sorgu)
+        server_stats = Server.objects.aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(status='active')),
+            new=Count('id', filter=Q(created_at__gte=yesterday)),
+        )
+        application_stats = Application.objects.aggregate(
+            total=Count('id'),
+            new=Count('id', filter=Q(created_at__gte=yesterday)),
+        )
         total_databases = Database.objects.count()
         
-        # Son 24 saatte eklenen kayıtlar
-        yesterday = now - timedelta(days=1)
-        new_servers = Server.objects.filter(created_at__gte=yesterday).count()
-        new_applications = Application.objects.filter(created_at__gte=yesterday).count()
+        total_servers = server_stats['total']
+        active_servers = server_stats['active']
+        total_applications = application_stats['total']
+        new_servers = server_stats['new']
+        new_applications = application_stats['new']
         
         return {
             'inventory': {
@@ -54,19 +86,28 @@ class DashboardDataService:
         last_week = now - timedelta(days=7)
         last_month = now - timedelta(days=30)
         
-        # Genel istatistikler
-        total_questions = Question.objects.count()
-        answered_questions = Question.objects.filter(answers__isnull=False).distinct().count()
-        total_answers = Answer.objects.count()
+        # Genel istatistikler ve son aktiviteler; cevaplanmış sorular sinyallerle
+        # güncellenen answer_count alanından sayılır, answers JOIN'ine gerek yok
+        question_stats = Question.objects.aggregate(
+            total=Count('id'),
+            answered=Count('id', filter=Q(answer_count__gt=0)),
+            new_week=Count('id', filter=Q(created_at__gte=last_week)),
+        )
+        answer_stats = Answer.objects.aggregate(
+            total=Count('id'),
+            new_week=Count('id', filter=Q(created_at__gte=last_week)),
+        )
         
-        # Son aktiviteler
-        new_questions_week = Question.objects.filter(created_at__gte=last_week).count()
-        new_answers_week = Answer.objects.filter(created_at__gte=last_week).count()
+        total_questions = question_stats['total']
+        answered_questions = question_stats['answered']
+        total_answers = answer_stats['total']
+        new_questions_week = question_stats['new_week']
+        new_answers_week = answer_stats['new_week']
         
         # Popüler sorular (son ay)
         popular_questions = Question.objects.filter(
             created_at__gte=last_month
-        ).order_by('-view_count')[:5]
+        ).order_by('-view_count').values('id', 'title', 'view_count', 'answer_count')[:5]
         
         # Cevap oranı
         answer_rate = round((answered_questions / total_questions * 100) if total_questions > 0 else 0, 1)
@@ -78,14 +119,7 @@ class DashboardDataService:
                 'answer_rate': answer_rate,
                 'new_questions_week': new_questions_week,
                 'new_answers_week': new_answers_week,
-                'popular_questions': [
-                    {
-                        'id': q.id,
-                        'title': q.title,
-                        'view_count': q.view_count,
-                        'answer_count': q.answers.count()
-                    } for q in popular_questions
-                ]
+                'popular_questions': list(popular_questions)
             }
         }
     
@@ -154,20 +188,29 @@ class DashboardDataService:
             is_active=True
         )
         
-        # Önemli duyurular
-        important_announcements = active_announcements.filter(is_important=True)[:3]
+        # Tüm sayaçlar tek sorguda
+        counts = active_announcements.aggregate(
+            total_active=Count('id'),
+            important=Count('id', filter=Q(is_important=True)),
+            pinned=Count('id', filter=Q(is_pinned=True)),
+        )
+        
+        # Listelerde kategori adı okunduğu için kategori JOIN ile gelir; yalnızca okunan kolonlar çekilir
+        listed_announcements = active_announcements.select_related('category').only(
+            'id', 'title', 'category__name', 'created_at', 'view_count', 'is_important', 'is_pinned', 'priority'
+        )
         
-        # Sabitlenmiş duyurular
-        pinned_announcements = active_announcements.filter(is_pinned=True)[:3]
+        # Önemli duyurular
+        important_announcements = listed_announcements.filter(is_important=True)[:3]
         
         # Son duyurular
-        recent_announcements = active_announcements.order_by('-created_at')[:5]
+        recent_announcements = listed_announcements.order_by('-created_at')[:5]
         
         return {
             'announcements': {
-                'total_active': active_announcements.count(),
-                'important_count': important_announcements.count(),
-                'pinned_count': pinned_announcements.filter(is_pinned=True).count(),
+                'total_active': counts['total_active'],
+                'important_count': counts['important'],
+                'pinned_count': counts['pinned'],
                 'important_announcements': [
                     {
                         'id': ann.id,
@@ -192,8 +235,10 @@ class DashboardDataService:
     @staticmethod
     def get_system_status():
         """Sistem durumu"""
-        # Sistem durumları
-        system_statuses = SystemStatus.objects.all()
+        # Sistem durumları; mesaj kırpma veritabanında yapılır, uzun metin taşınmaz
+        system_statuses = SystemStatus.objects.annotate(
+            message_short=Left('message', 100)
+        ).only('id', 'system_name', 'status', 'started_at')
         
         # Bakım bildirimleri
         now = timezone.now()
@@ -202,17 +247,22 @@ class DashboardDataService:
             start_time__gte=now - timedelta(hours=24)
         )
         
-        # Durum özeti
-        operational_count = system_statuses.filter(status='operational').count()
-        warning_count = system_statuses.filter(status='warning').count()
-        critical_count = system_statuses.filter(status='critical').count()
+        # Durum özeti tek sorguda; yavaşlık/kısmi kesinti uyarı, büyük kesinti kritik sayılır
+        counts = SystemStatus.objects.aggregate(
+            total=Count('id'),
+            operational=Count('id', filter=Q(status='operational')),
+            warning=Count('id', filter=Q(status__in=['degraded', 'partial_outage'])),
+            critical=Count('id', filter=Q(status='major_outage')),
+            maintenance=Count('id', filter=Q(status='maintenance')),
+        )
         
         return {
             'system_status': {
-                'operational_count': operational_count,
-                'warning_count': warning_count,
-                'critical_count': critical_count,
-                'total_systems': system_statuses.count(),
+                'operational_count': counts['operational'],
+                'warning_count': counts['warning'],
+                'critical_count': counts['critical'],
+                'maintenance_count': counts['maintenance'],
+                'total_systems': counts['total'],
                 'active_maintenances': [
                     {
                         'id': maint.id,
@@ -227,8 +277,8 @@ class DashboardDataService:
                     {
                         'name': sys.system_name,
                         'status': sys.get_status_display(),
-                        'last_check': sys.last_check,
-                        'description': sys.description[:100] if sys.description else ''
+                        'last_check': sys.started_at,
+                        'description': sys.message_short or ''
                     } for sys in system_statuses
                 ]
             }
@@ -241,15 +291,17 @@ class DashboardDataService:
         last_24h = now - timedelta(days=1)
         last_week = now - timedelta(days=7)
         
-        # Çalıştırma istatistikleri
-        total_executions = PlaybookExecution.objects.count()
-        executions_24h = PlaybookExecution.objects.filter(created_at__gte=last_24h).count()
-        executions_week = PlaybookExecution.objects.filter(created_at__gte=last_week).count()
-        
-        # Başarı oranları
-        successful_executions = PlaybookExecution.objects.filter(
-            status='completed', return_code=0
-        ).count()
+        # Çalıştırma sayıları ve başarı oranı tek sorguda
+        execution_stats = PlaybookExecution.objects.aggregate(
+            total=Count('id'),
+            last_24h=Count('id', filter=Q(created_at__gte=last_24h)),
+            last_week=Count('id', filter=Q(created_at__gte=last_week)),
+            successful=Count('id', filter=Q(status='completed', return_code=0)),
+        )
+        total_executions = execution_stats['total']
+        executions_24h = execution_stats['last_24h']
+        executions_week = execution_stats['last_week']
+        successful_executions = execution_stats['successful']
         success_rate = round((successful_executions / total_executions * 100) if total_executions > 0 else 0, 1)
         
         # Programlı görevler
@@ -284,22 +336,30 @@ class DashboardDataService:
     def get_performance_alerts():
         """Performans uyarıları"""
         # Aktif uyarılar
-        active_alerts = Alert.objects.filter(status='open').order_by('-created_at')
-        
-        # Kritik uyarılar
-        critical_alerts = active_alerts.filter(severity='critical')[:5]
-        
-        # Uyarı özeti
+        active_alerts = Alert.objects.filter(status='open')
+        
+        # Uyarı özeti ve toplam tek sorguda
+        counts = active_alerts.aggregate(
+            total=Count('id'),
+            critical=Count('id', filter=Q(severity='critical')),
+            warning=Count('id', filter=Q(severity='warning')),
+            info=Count('id', filter=Q(severity='info')),
+        )
         alert_summary = {
-            'critical': active_alerts.filter(severity='critical').count(),
-            'warning': active_alerts.filter(severity='warning').count(),
-            'info': active_alerts.filter(severity='info').count()
+            'critical': counts['critical'],
+            'warning': counts['warning'],
+            'info': counts['info']
         }
         
+        # Kritik uyarılar
+        critical_alerts = active_alerts.filter(severity='critical').only(
+            'id', 'title', 'severity', 'created_at'
+        ).order_by('-created_at')[:5]
+        
         return {
             'performance': {
                 'alert_summary': alert_summary,
-                'total_active_alerts': active_alerts.count(),
+                'total_active_alerts': counts['total'],
                 'critical_alerts': [
                     {
                         'id': alert.id,
@@ -316,9 +376,10 @@ class DashboardDataService:
     def get_quick_links():
         """Hızlı linkler"""
         # En çok kullanılan linkler
-        popular_links = Link.objects.annotate(
-            click_count=Count('clicks')
-        ).filter(is_active=True).order_by('-click_count')[:8]
+        # click_count link yönlendirmesinde F() ile artırılır; LinkClick tablosunu taramaya gerek yok
+        popular_links = Link.objects.filter(is_active=True).select_related('category').only(
+            'id', 'title', 'url', 'description', 'click_count', 'category__name'
+        ).order_by('-click_count')[:8]
         
         return {
             'quick_links': [
@@ -335,56 +396,55 @@ class DashboardDataService:
     
     @classmethod
     def get_complete_dashboard_data(cls):
-        """Tüm dashboard verilerini topla"""
+        """Tüm dashboard verilerini topla (bölümler ayrı ayrı cache'lenir)"""
         data = {}
         
-        try:
-            data.update(cls.get_system_overview())
-        except Exception as e:
-            data['inventory'] = {'error': str(e)}
-        
-        try:
-            data.update(cls.get_knowledge_base_stats())
-        except Exception as e:
-            data['knowledge_base'] = {'error': str(e)}
-        
-        try:
-            data.update(cls.get_duty_schedule_info())
-        except Exception as e:
-            data['duty_schedule'] = {'error': str(e)}
-        
-        try:
-            data.update(cls.get_announcements_summary())
-        except Exception as e:
-            data['announcements'] = {'error': str(e)}
-        
-        try:
-            data.update(cls.get_system_status())
-        except Exception as e:
-            data['system_status'] = {'error': str(e)}
-        
-        try:
-            data.update(cls.get_automation_stats())
-        except Exception as e:
-            data['automation'] = {'error': str(e)}
-        
-        try:
-            data.update(cls.get_performance_alerts())
-        except Exception as e:
-            data['performance'] = {'error': str(e)}
-        
-        try:
-            data.update(cls.get_quick_links())
-        except Exception as e:
-            data['quick_links'] = {'error': str(e)}
-        
-        try:
-            data.update(cls.get_certificate_stats())
-        except Exception as e:
-            data['certificates'] = {'error': str(e)}
+        namespaces = {name: section_namespace(name) for name, _, _ in DASHBOARD_SECTIONS}
+        versions = current_versions(list(namespaces.values()))
+        keys = {
+            name: versioned_key(namespace, 'data', versions[namespace])
+            for name, namespace in namespaces.items()
+        }
+        cached = cache.get_many(list(keys.values()))
+        
+        missing = [
+            (name, method, timeout) for name, method, timeout in DASHBOARD_SECTIONS
+            if keys[name] not in cached
+        ]
+        
+        # Eksik bölümler bağımsız tablolara gittiği için sorguları paralel çalışır
+        built = {}
+        if missing:
+            with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                futures = {
+                    name: executor.submit(cls._build_section, method)
+                    for name, method, _ in missing
+                }
+            for name, method, timeout in missing:
+                try:
+                    built[name] = futures[name].result()
+                except Exception as e:
+                    # Hatalı bölüm cache'lenmez, bir sonraki istekte yeniden denenir
+                    built[name] = None
+                    data[name] = {'error': str(e)}
+                    continue
+                cache.set(keys[name], built[name], timeout)
+        
+        for name, _, _ in DASHBOARD_SECTIONS:
+            section = cached.get(keys[name]) or built.get(name)
+            if section is not None:
+                data.update(section)
         
         return data
     
+    @classmethod
+    def _build_section(cls, method):
+        """Bölümü worker thread'inde üret; thread'in açtığı DB bağlantısını kapat"""
+        try:
+            return getattr(cls, method)()
+        finally:
+            connection.close()
+    
     @staticmethod
     def get_certificate_stats():
         """Sertifika istatistikleri"""
@@ -406,77 +466,44 @@ class DashboardDataService:
             thirty_days = now + timedelta(days=30)
             seven_days = now + timedelta(days=7)
             
+            # Model başına dört sayaç tek sorguda
+            expiry_counts = dict(
+                total=Count('id'),
+                expiring_30=Count('id', filter=Q(valid_to__lte=thirty_days, valid_to__gt=now)),
+                expiring_7=Count('id', filter=Q(valid_to__lte=seven_days, valid_to__gt=now)),
+                expired=Count('id', filter=Q(valid_to__lte=now)),
+            )
+            
             # KDB Sertifika istatistikleri
-            total_kdb = KdbCertificate.objects.count()
-            kdb_expiring_30 = KdbCertificate.objects.filter(
-                valid_to__lte=thirty_days,
-                valid_to__gt=now
-            ).count()
-            kdb_expiring_7 = KdbCertificate.objects.filter(
-                valid_to__lte=seven_days,
-                valid_to__gt=now
-            ).count()
-            kdb_expired = KdbCertificate.objects.filter(
-                valid_to__lte=now
-            ).count()
+            kdb_stats = KdbCertificate.objects.aggregate(**expiry_counts)
+            total_kdb = kdb_stats['total']
+            kdb_expiring_30 = kdb_stats['expiring_30']
+            kdb_expiring_7 = kdb_stats['expiring_7']
+            kdb_expired = kdb_stats['expired']
             
             # Java Sertifika istatistikleri
-            total_java = JavaCertificate.objects.count()
-            java_expiring_30 = JavaCertificate.objects.filter(
-                valid_to__lte=thirty_days,
-                valid_to__gt=now
-            ).count()
-            java_expiring_7 = JavaCertificate.objects.filter(
-                valid_to__lte=seven_days,
-                valid_to__gt=now
-            ).count()
-            java_expired = JavaCertificate.objects.filter(
-                valid_to__lte=now
-            ).count()
+            java_stats = JavaCertificate.objects.aggregate(**expiry_counts)
+            total_java = java_stats['total']
+            java_expiring_30 = java_stats['expiring_30']
+            java_expiring_7 = java_stats['expiring_7']
+            java_expired = java_stats['expired']
+            
+            # Yaklaşan sertifikalar (en kritik 5 tanesi); iki tablo tek UNION ALL sorgusunda
+            expiring_filter = Q(valid_to__lte=thirty_days, valid_to__gt=now)
+            listed_fields = ('id', 'common_name', 'server_hostname', 'valid_to', 'environment')
+            
+            kdb_recent = KdbCertificate.objects.filter(expiring_filter).order_by().values(
+                *listed_fields, type=Value('kdb', output_field=CharField()), app=F('application_name')
+            )
+            java_recent = JavaCertificate.objects.filter(expiring_filter).order_by().values(
+                *listed_fields, type=Value('java', output_field=CharField()), app=F('java_application')
+            )
             
-            # Yaklaşan sertifikalar (en kritik 5 tanesi)
             recent_expiring = []
-            
-            # KDB sertifikaları
-            kdb_recent = KdbCertificate.objects.filter(
-                valid_to__lte=thirty_days,
-                valid_to__gt=now
-            ).order_by('valid_to')[:3]
-            
-            for cert in kdb_recent:
-                days_left = (cert.valid_to - now).days
-                recent_expiring.append({
-                    'id': cert.id,
-                    'type': 'kdb',
-                    'common_name': cert.common_name,
-                    'server_hostname': cert.server_hostname,
-                    'valid_to': cert.valid_to,
-                    'days_left': days_left,
-                    'environment': cert.environment,
-                    'application_name': cert.application_name
-                })
-            
-            # Java sertifikaları
-            java_recent = JavaCertificate.objects.filter(
-                valid_to__lte=thirty_days,
-                valid_to__gt=now
-            ).order_by('valid_to')[:2]
-            
-            for cert in java_recent:
-                days_left = (cert.valid_to - now).days
-                recent_expiring.append({
-                    'id': cert.id,
-                    'type': 'java',
-                    'common_name': cert.common_name,
-                    'server_hostname': cert.server_hostname,
-                    'valid_to': cert.valid_to,
-                    'days_left': days_left,
-                    'environment': cert.environment,
-                    'application_name': cert.java_application
-                })
-            
-            # Tarihe göre sırala
-            recent_expiring.sort(key=lambda x: x['valid_to'])
+            for cert in kdb_recent.union(java_recent, all=True).order_by('valid_to')[:5]:
+                cert['application_name'] = cert.pop('app')
+                cert['days_left'] = (cert['valid_to'] - now).days
+                recent_expiring.append(cert)
             
             return {
                 'certificates': {
@@ -498,7 +525,7 @@ class DashboardDataService:
                         'expiring_7': java_expiring_7,
                         'expired': java_expired
                     },
-                    'recent_expiring': recent_expiring[:5],
+                    'recent_expiring': recent_expiring,
                     'available': True
                 }
             }
@@ -524,22 +551,26 @@ class DashboardDataService:
         try:
             now = timezone.now()
             
+            week_ago = now - timedelta(days=7)
+            
             # Aktif duyurular (yayında ve süresi dolmamış)
-            active_announcements = Announcement.objects.filter(
-                status='published'
-            ).filter(
+            active_filter = Q(status='published') & (
                 Q(yayin_bitis_tarihi__isnull=True) | Q(yayin_bitis_tarihi__gt=now)
             )
-            
-            # Genel istatistikler
-            total_announcements = Announcement.objects.count()
-            published_count = active_announcements.count()
-            draft_count = Announcement.objects.filter(status='draft').count()
-            archived_count = Announcement.objects.filter(status='archived').count()
-            
-            # Önemli ve sabitlenmiş duyurular
-            important_count = active_announcements.filter(is_important=True).count()
-            pinned_count = active_announcements.filter(sabitle=True).count()
+            active_announcements = Announcement.objects.filter(active_filter)
+            
+            # Genel, önem/sabitleme ve haftalık sayaçlar tek sorguda
+            counts = Announcement.objects.aggregate(
+                total=Count('id'),
+                published=Count('id', filter=active_filter),
+                draft=Count('id', filter=Q(status='draft')),
+                archived=Count('id', filter=Q(status='archived')),
+                important=Count('id', filter=active_filter & Q(is_important=True)),
+                pinned=Count('id', filter=active_filter & Q(sabitle=True)),
+                new_week=Count('id', filter=Q(created_at__gte=week_ago)),
+                published_week=Count('id', filter=Q(published_at__gte=week_ago)),
+                archived_week=Count('id', filter=Q(status='archived', updated_at__gte=week_ago)),
+            )
             
             # Duyuru türü dağılımı
             type_distribution = active_announcements.values('duyuru_tipi').annotate(
@@ -549,6 +580,9 @@ class DashboardDataService:
             # Son 5 duyuru (dashboard için)
             recent_announcements = active_announcements.select_related(
                 'category', 'created_by'
+            ).only(
+                'id', 'title', 'slug', 'summary', 'category__name', 'created_by__id', 'duyuru_tipi',
+                'onem_seviyesi', 'published_at', 'is_important', 'sabitle', 'view_count', 'yayin_bitis_tarihi'
             ).order_by('-sabitle', '-onem_seviyesi', '-published_at')[:5]
             
             recent_list = []
@@ -575,6 +609,8 @@ class DashboardDataService:
             expiring_soon = active_announcements.filter(
                 yayin_bitis_tarihi__isnull=False,
                 yayin_bitis_tarihi__lte=thirty_days
+            ).only(
+                'id', 'title', 'slug', 'onem_seviyesi', 'yayin_bitis_tarihi'
             ).order_by('yayin_bitis_tarihi')[:3]
             
             expiring_list = []
@@ -591,28 +627,20 @@ class DashboardDataService:
                 })
             
             # Haftalık aktivite
-            week_ago = now - timedelta(days=7)
             weekly_stats = {
-                'new_announcements': Announcement.objects.filter(
-                    created_at__gte=week_ago
-                ).count(),
-                'published_this_week': Announcement.objects.filter(
-                    published_at__gte=week_ago
-                ).count(),
-                'archived_this_week': Announcement.objects.filter(
-                    status='archived',
-                    updated_at__gte=week_ago
-                ).count()
+                'new_announcements': counts['new_week'],
+                'published_this_week': counts['published_week'],
+                'archived_this_week': counts['archived_week']
             }
             
             return {
                 'announcements': {
-                    'total': total_announcements,
-                    'published': published_count,
-                    'draft': draft_count,
-                    'archived': archived_count,
-                    'important': important_count,
-                    'pinned': pinned_count,
+                    'total': counts['total'],
+                    'published': counts['published'],
+                    'draft': counts['draft'],
+                    'archived': counts['archived'],
+                    'important': counts['important'],
+                    'pinned': counts['pinned'],
                     'recent': recent_list,
                     'expiring_soon': expiring_list,
                     'type_distribution': list(type_distribution),
@@ -646,64 +674,57 @@ class DashboardDataService:
             now = timezone.now()
             today = now.date()
             
-            # Toplam nöbet kayıtları
-            total_duties = Nobetci.objects.count()
-            
-            # Bugünkü nöbetçi
-            current_duty = Nobetci.get_current_duty()
-            
-            # Sonraki nöbetçi
-            next_duty = Nobetci.get_next_duty()
-            
-            # Bu ay nöbet sayısı
-            this_month_duties = Nobetci.objects.filter(
-                tarih__year=today.year,
-                tarih__month=today.month
-            ).count()
-            
-            # Geçen ay nöbet sayısı
             last_month = today.replace(day=1) - timedelta(days=1)
-            last_month_duties = Nobetci.objects.filter(
-                tarih__year=last_month.year,
-                tarih__month=last_month.month
-            ).count()
-            
-            # Gelecek hafta nöbetçileri
             next_week = today + timedelta(days=7)
-            upcoming_duties = list(Nobetci.objects.filter(
-                tarih__gt=today,
+            
+            # Toplam, bu ay, geçen ay ve son senkronizasyon tek sorguda
+            duty_counts = Nobetci.objects.aggregate(
+                total=Count('id'),
+                this_month=Count('id', filter=Q(tarih__year=today.year, tarih__month=today.month)),
+                last_month=Count('id', filter=Q(tarih__year=last_month.year, tarih__month=last_month.month)),
+                last_sync=Max('senkron_tarihi'),
+            )
+            total_duties = duty_counts['total']
+            this_month_duties = duty_counts['this_month']
+            last_month_duties = duty_counts['last_month']
+            
+            # Bugünkü, sonraki ve gelecek hafta nöbetçileri aynı pencereden okunur
+            duty_fields = ('id', 'tarih', 'ad_soyad', 'telefon', 'email')
+            window = list(Nobetci.objects.filter(
+                tarih__gte=today,
                 tarih__lte=next_week
-            ).order_by('tarih')[:5].values(
-                'id', 'tarih', 'ad_soyad', 'telefon', 'email'
-            ))
+            ).order_by('tarih').values(*duty_fields)[:6])
+            
+            current_duty = window[0] if window and window[0]['tarih'] == today else None
+            upcoming_duties = window[1:] if current_duty else window[:5]
             
-            # Son senkronizasyon tarihi
-            last_sync = Nobetci.objects.filter(
-                senkron_tarihi__isnull=False
-            ).order_by('-senkron_tarihi').first()
+            # Pencerede gelecek nöbet yoksa sonraki nöbetçi ayrıca aranır
+            next_duty = upcoming_duties[0] if upcoming_duties else Nobetci.objects.filter(
+                tarih__gt=today
+            ).order_by('tarih').values(*duty_fields).first()
             
             return {
                 'duty_schedule': {
                     'total_duties': total_duties,
                     'current_duty': {
-                        'id': current_duty.id if current_duty else None,
-                        'tarih': current_duty.tarih.strftime('%d.%m.%Y') if current_duty else None,
-                        'ad_soyad': current_duty.ad_soyad if current_duty else None,
-                        'telefon': current_duty.telefon if current_duty else None,
-                        'email': current_duty.email if current_duty else None,
+                        'id': current_duty['id'] if current_duty else None,
+                        'tarih': current_duty['tarih'].strftime('%d.%m.%Y') if current_duty else None,
+                        'ad_soyad': current_duty['ad_soyad'] if current_duty else None,
+                        'telefon': current_duty['telefon'] if current_duty else None,
+                        'email': current_duty['email'] if current_duty else None,
                         'exists': bool(current_duty)
                     },
                     'next_duty': {
-                        'id': next_duty.id if next_duty else None,
-                        'tarih': next_duty.tarih.strftime('%d.%m.%Y') if next_duty else None,
-                        'ad_soyad': next_duty.ad_soyad if next_duty else None,
-                        'days_until': next_duty.days_until if next_duty else None,
+                        'id': next_duty['id'] if next_duty else None,
+                        'tarih': next_duty['tarih'].strftime('%d.%m.%Y') if next_duty else None,
+                        'ad_soyad': next_duty['ad_soyad'] if next_duty else None,
+                        'days_until': (next_duty['tarih'] - today).days if next_duty else None,
                         'exists': bool(next_duty)
                     },
                     'this_month_count': this_month_duties,
                     'last_month_count': last_month_duties,
                     'upcoming_duties': upcoming_duties,
-                    'last_sync': last_sync.senkron_tarihi.strftime('%d.%m.%Y %H:%M') if last_sync and last_sync.senkron_tarihi else None,
+                    'last_sync': duty_counts['last_sync'].strftime('%d.%m.%Y %H:%M') if duty_counts['last_sync'] else None,
                     'available': True
                 }
             }
@@ -778,7 +799,7 @@ class DashboardDataService:
                 })
             
             # En popüler template'ler
-            popular_templates = AnsibleJobTemplate.objects.filter(
+            popular_templates = AnsibleJobTemplate.objects.select_related('category').filter(
                 is_enabled=True,
                 usage_count__gt=0
             ).order_by('-usage_count')[:3]
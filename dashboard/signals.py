@@ -0,0 +1,28 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from core.versioned_cache import bump_version
+from duyurular.models import Announcement
+from envanter.models import Server
+from performans.models import Alert
+from .services import section_namespace
+
+# Her model yalnızca kendi verisini gösteren dashboard bölümünü geçersiz kılar
+INVALIDATED_SECTIONS = {
+    Server: 'inventory',
+    Alert: 'performance',
+    Announcement: 'announcements',
+}
+
+
+@receiver(post_save, sender=Server)
+@receiver(post_delete, sender=Server)
+@receiver(post_save, sender=Alert)
+@receiver(post_delete, sender=Alert)
+@receiver(post_save, sender=Announcement)
+@receiver(post_delete, sender=Announcement)
+def invalidate_dashboard_section(sender, update_fields=None, **kwargs):
+    """Invalidate the cached dashboard section backed by the changed model"""
+    # Sayfa görüntülenme sayacı dashboard bölümlerini etkilemez
+    if update_fields is not None and set(update_fields) == {'view_count'}:
+        return
+    bump_version(section_namespace(INVALIDATED_SECTIONS[sender]))
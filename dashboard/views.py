@@ -2,13 +2,14 @@ from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import TemplateView
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.cache import cache_page
 from django.utils.decorators import method_decorator
 from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
 import json
+import orjson
 
 from .services import DashboardDataService
 
@@ -51,7 +52,11 @@ def dashboard_api_data(request):
     duty_data = dashboard_service.get_duty_schedule_stats()
     data.update(duty_data)
     
-    return JsonResponse(data, safe=False)
+    # orjson datetime/str kodlamasını C tarafında yapar; Decimal gibi tipler str'ye düşer
+    return HttpResponse(
+        orjson.dumps(data, default=str, option=orjson.OPT_NAIVE_UTC),
+        content_type='application/json'
+    )
 
 
 @login_required
@@ -46,7 +46,7 @@ class Link(BaseModel):
     allowed_departments = models.CharField(max_length=500, blank=True, help_text='İzinli departmanlar (virgülle ayır)')
     
     # Statistics
-    click_count = models.PositiveIntegerField(default=0)
+    click_count = models.PositiveIntegerField(default=0, db_index=True)
     
     # Status monitoring
     last_checked = models.DateTimeField(null=True, blank=True)
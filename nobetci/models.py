@@ -80,6 +80,9 @@ class DutySchedule(BaseModel):
         ordering = ['start_date', 'start_time']
         verbose_name = 'Nöbet Programı'
         verbose_name_plural = 'Nöbet Programları'
+        indexes = [
+            models.Index(fields=['start_date', 'end_date'], name='nobetci_duty_date_range'),
+        ]
     
     def __str__(self):
         return f"{self.user.get_full_name() or self.user.username} - {self.duty_type.name} ({self.start_date})"
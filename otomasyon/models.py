@@ -119,6 +119,9 @@ class PlaybookExecution(BaseModel):
         ordering = ['-created_at']
         verbose_name = 'Playbook Çalıştırma'
         verbose_name_plural = 'Playbook Çalıştırmalar'
+        indexes = [
+            models.Index(fields=['status', '-created_at'], name='otomasyon_exec_status_created'),
+        ]
     
     def __str__(self):
         return f"{self.playbook.name} - {self.execution_id}"
@@ -154,3 +154,6 @@ class Alert(BaseModel):
         ordering = ['-created_at']
         verbose_name = 'Performans Uyarısı'
         verbose_name_plural = 'Performans Uyarıları'
+        indexes = [
+            models.Index(fields=['status', 'severity', '-created_at'], name='performans_alert_status_sev'),
+        ]
@@ -33,6 +33,7 @@ DJANGO_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 THIRD_PARTY_APPS = [
@@ -87,8 +88,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
-                'askgt.context_processors.askgt_categories',
-                'askgt.context_processors.askgt_stats',
+                'askgt.context_processors.askgt_menu',
             ],
         },
     },
@@ -456,6 +456,16 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'askgt.tasks.send_weekly_stats_report',
         'schedule': crontab(hour=10, minute=0, day_of_week=1),
     },
+    # AskGT görüntülenme sayaçlarını veritabanına yaz (30 saniyede bir)
+    'askgt-flush-view-counters': {
+        'task': 'askgt.tasks.flush_view_counters',
+        'schedule': 30.0,
+    },
+    # AskGT kullanıcı aktivite snapshot'ı (saatlik)
+    'askgt-user-activity-stats': {
+        'task': 'askgt.tasks.refresh_user_activity_stats',
+        'schedule': crontab(minute=15),
+    },
 }
 
 # Security Settings